@@ -0,0 +1,140 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+# Layout: magic, little-endian uint32 index length, JSON index, then the asset bytes.
+# The index maps name -> [offset, length, sha256] with offsets relative to the data section.
+BUNDLE_MAGIC = b'AQB1'
+BUNDLE_NAME = 'assets.bundle'
+HEADER = struct.Struct('<4sI')
+
+
+def build_bundle(asset_dir, bundle_path):
+    """Pack every file in asset_dir into a single bundle file"""
+    names = sorted(name for name in os.listdir(asset_dir)
+                   if os.path.isfile(os.path.join(asset_dir, name)))
+
+    index = {}
+    offset = 0
+    for name in names:
+        with open(os.path.join(asset_dir, name), 'rb') as f:
+            data = f.read()
+        index[name] = [offset, len(data), hashlib.sha256(data).hexdigest()]
+        offset += len(data)
+
+    index_bytes = json.dumps(index, sort_keys=True).encode('utf-8')
+    tmp_path = bundle_path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(HEADER.pack(BUNDLE_MAGIC, len(index_bytes)))
+        out.write(index_bytes)
+        for name in names:
+            with open(os.path.join(asset_dir, name), 'rb') as f:
+                out.write(f.read())
+    os.replace(tmp_path, bundle_path)
+    return index
+
+
+class BundleReader(io.RawIOBase):
+    """Read-only file object over a slice of the bundle, without copying it"""
+    def __init__(self, view):
+        self.view = view
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self.view) - self.pos)
+        buffer[:size] = self.view[self.pos:self.pos + size]
+        self.pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.pos = max(0, offset)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+        super().close()
+
+
+class AssetBundle:
+    """A packed asset bundle, memory-mapped and read through zero-copy slices"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and platforms without mmap fall back to an in-memory copy
+            self.data = self.file.read()
+        self.view = memoryview(self.data)
+
+        if len(self.view) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not an asset bundle")
+        magic, index_length = HEADER.unpack_from(self.view)
+        if magic != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an asset bundle")
+        index_end = HEADER.size + index_length
+        self.index = json.loads(bytes(self.view[HEADER.size:index_end]).decode('utf-8'))
+        self.data_start = index_end
+
+    def names(self):
+        """List the assets in the bundle"""
+        return list(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def get_view(self, name):
+        """Get a zero-copy memoryview of an asset's bytes"""
+        offset, length, _ = self.index[name]
+        start = self.data_start + offset
+        return self.view[start:start + length]
+
+    def open(self, name):
+        """Open an asset as a read-only file object"""
+        return BundleReader(self.get_view(name))
+
+    def verify(self):
+        """Check every asset against its recorded size and hash"""
+        for name, (offset, length, digest) in self.index.items():
+            view = self.get_view(name)
+            try:
+                if len(view) != length or hashlib.sha256(view).hexdigest() != digest:
+                    return False
+            finally:
+                view.release()
+        return True
+
+    def close(self):
+        """Release the mapping and the underlying file"""
+        self.view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
+if __name__ == '__main__':
+    # python asset_bundle.py [asset_dir] [bundle_path]
+    asset_dir = sys.argv[1] if len(sys.argv) > 1 else 'assets'
+    bundle_path = sys.argv[2] if len(sys.argv) > 2 else BUNDLE_NAME
+    index = build_bundle(asset_dir, bundle_path)
+    print(f"Packed {len(index)} assets into {bundle_path} ({os.path.getsize(bundle_path)} bytes)")
@@ -1,39 +1,352 @@
-import boto3
+import asyncio
 import os
 import concurrent.futures
-from botocore.config import Config
-from botocore.exceptions import ClientError
+import contextlib
+import hashlib
+import heapq
+import itertools
+import json
+import mimetypes
+import queue
+import statistics
+import threading
 import time
+from asset_specs import ASSET_LEVELS, SOURCE_NAMES, asset_level
+from blob_store import BlobStore
+from telemetry import Telemetry
+
+# Byte budget for downloaded assets; least recently used blobs beyond it are evicted
+CACHE_MAX_BYTES = int(os.getenv('ASSET_CACHE_MAX_MB', '256')) * 1024 * 1024
+
+# Upper bound for concurrent downloads, however fast the link measures
+MAX_DOWNLOAD_CONCURRENCY = 16
+
+# Objects above the threshold download as parallel byte-range parts
+MULTIPART_THRESHOLD = 1024 * 1024
+MULTIPART_CHUNKSIZE = 512 * 1024
+MULTIPART_CONCURRENCY = 4
+# S3 parts must be at least 5 MB, so uploads split larger objects into bigger parts
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+
+def size_class(nbytes):
+    """Bucket a transfer size by powers of four, so latencies compare like with like"""
+    return int(nbytes).bit_length() // 2
+
+
+class ConcurrencyLimiter:
+    """How many downloads may run at once, tuned from measured parallel speedup and latency
+
+    Every download is weighed by the fastest time seen for its size class, so a window's
+    total weight over its wall time is the parallelism actually achieved. This holds
+    however the queue is ordered (largest first makes later windows smaller), where raw
+    bytes/s would fall with object size. After each window of completed downloads the
+    limit grows by one while achieved parallelism keeps scaling with it, and shrinks by
+    a quarter once it stops paying off or downloads run far slower than their size
+    class's best (a saturated link).
+    """
+    def __init__(self, initial=4, minimum=1, maximum=MAX_DOWNLOAD_CONCURRENCY, sample_size=4, adaptive=True):
+        self.minimum = minimum
+        self.maximum = max(maximum, initial)
+        self.limit = max(minimum, initial)
+        self.sample_size = sample_size
+        self.adaptive = adaptive
+        self.lock = threading.Lock()
+        self.window_start = None
+        self.window = []  # (size class, latency) of each download in the current window
+        self.last_window = None  # (downloads, elapsed) of the previous window
+        self.base_latency = {}  # size class -> fastest download seen
+
+    def parallelism(self, window, elapsed):
+        """Seconds of best-case download time completed per second of wall time"""
+        return sum(self.base_latency[size] for size, _ in window) / max(elapsed, 1e-6)
+
+    def record(self, nbytes, started, finished):
+        """Record one finished download (monotonic start and end times)"""
+        if not self.adaptive:
+            return
+        with self.lock:
+            if self.window_start is None:
+                self.window_start = started
+            size, latency = size_class(nbytes), finished - started
+            if latency < self.base_latency.get(size, float('inf')):
+                self.base_latency[size] = latency
+            self.window.append((size, latency))
+            # A window spans at least one download per slot, so it sees the current limit
+            if len(self.window) < max(self.sample_size, self.limit):
+                return
+
+            elapsed = finished - self.window_start
+            achieved = self.parallelism(self.window, elapsed)
+            # The previous window is re-weighed with today's baselines so the two compare
+            last = self.parallelism(*self.last_window) if self.last_window else None
+            slowdown = statistics.median(latency / max(self.base_latency[size], 1e-6)
+                                         for size, latency in self.window)
+
+            if last is not None and achieved < 0.8 * last:
+                self.limit = max(self.minimum, int(self.limit * 0.75))
+            elif slowdown <= 2 and (last is None or achieved > (1 + 0.5 / self.limit) * last):
+                # One more slot should buy at least half its proportional share; on a
+                # saturated link downloads slow down with every slot added, so stop there
+                self.limit = min(self.maximum, self.limit + 1)
+            self.last_window = (self.window, elapsed)
+            self.window_start = finished
+            self.window = []
+
+
+# Published assets are only replaced by republishing, which the game notices through
+# the listing's ETags, so HTTP caches may keep them for a long time
+UPLOAD_CACHE_CONTROL = 'public, max-age=31536000'
+
+
+def expected_etag(path, transfer_config):
+    """Compute the ETag S3 will give a file uploaded with transfer_config"""
+    # Single-part objects get the MD5 of their bytes; multipart objects get the MD5
+    # of the concatenated part MD5s plus the part count
+    size = os.path.getsize(path)
+    chunk_size = transfer_config.multipart_chunksize
+    with open(path, 'rb') as f:
+        if size < transfer_config.multipart_threshold:
+            return hashlib.md5(f.read()).hexdigest()
+        part_digests = [hashlib.md5(chunk).digest()
+                        for chunk in iter(lambda: f.read(chunk_size), b'')]
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+class ProvideListing:
+    """s3transfer subscriber handing over an object's size and ETag from the listing"""
+    # With both provided up front the transfer manager skips its HeadObject
+    def __init__(self, entry):
+        self.entry = entry
+
+    def on_queued(self, future, **kwargs):
+        future.meta.provide_transfer_size(self.entry['size'])
+        future.meta.provide_object_etag(self.entry['etag'])
+
+
+def download_priority(key, size):
+    """Sort key for the download queue: level 1 assets first, then largest first"""
+    # Starting big objects early keeps them from finishing last on their own
+    return (asset_level(key) > 1, -size)
+
+class S3Health:
+    """Session-wide S3 availability, tracked as an open or closed circuit"""
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.verified = False
+        self.failures = 0
+        self.opened_at = 0
+        self.lock = threading.Lock()
+
+    def needs_probe(self):
+        """Check if a head_bucket probe is needed to know the current state"""
+        with self.lock:
+            if self.state == 'open':
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not self.verified
+
+    def is_closed(self):
+        """Check if requests are currently allowed through"""
+        with self.lock:
+            return self.state == 'closed'
+
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        with self.lock:
+            self.state = 'closed'
+            self.verified = True
+            self.failures = 0
+
+    def record_failure(self, trip=False):
+        """Count a failed request and open the circuit once the threshold is hit"""
+        with self.lock:
+            self.failures += 1
+            if trip or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.verified = False
+                self.opened_at = time.monotonic()
+
+
+# Health is shared by every manager talking to the same bucket in this session
+_health_states = {}
+_health_lock = threading.Lock()
+
+def get_s3_health(bucket_name):
+    """Get the shared health state for a bucket"""
+    with _health_lock:
+        if bucket_name not in _health_states:
+            _health_states[bucket_name] = S3Health()
+        return _health_states[bucket_name]
+
+
+# Every manager caching into the same directory shares one blob store, so one
+# manager's eviction never removes a blob another is using
+_blob_stores = {}
+_blob_store_lock = threading.Lock()
+
+def get_blob_store(cache_dir):
+    """Get the shared blob store for a cache directory"""
+    root = os.path.abspath(os.path.join(cache_dir, 'blobs'))
+    # Where SurfaceCache and SoundCache keep the pixels and PCM decoded from blobs
+    derived = [os.path.abspath(os.path.join(cache_dir, name)) for name in ('surfaces', 'sounds')]
+    with _blob_store_lock:
+        if root not in _blob_stores:
+            _blob_stores[root] = BlobStore(root, CACHE_MAX_BYTES, shared_dirs=derived)
+        return _blob_stores[root]
+
 
 class GameAssetManager:
-    def __init__(self):
-        # Configure boto3 with retries and timeouts
-        config = Config(
-            retries = dict(
-                max_attempts = 3,
-                mode = 'adaptive'
-            ),
-            connect_timeout = 5,
-            read_timeout = 10
-        )
-        self.s3 = boto3.client('s3', config=config)
+    def __init__(self, max_workers=4, adaptive=True, telemetry=None):
+        # max_workers is the starting download concurrency; with adaptive it is then
+        # tuned between 1 and MAX_DOWNLOAD_CONCURRENCY from measured transfers
+        max_concurrency = max(max_workers, MAX_DOWNLOAD_CONCURRENCY) if adaptive else max_workers
+        # The boto3 client is created on first use, so startups that never reach
+        # S3 never pay for importing boto3
+        self.client = None
+        self.client_lock = threading.Lock()
+        # Counters and latency histograms; pass the game's instance to share one export
+        self.telemetry = telemetry if telemetry is not None else Telemetry()
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.limiter = ConcurrencyLimiter(max_workers, maximum=max_concurrency, adaptive=adaptive)
         self.bucket_name = os.getenv('S3_BUCKET_NAME', 'game-assets')
+        self.health = get_s3_health(self.bucket_name)
+        self.executor = None
+        self.blobs = None
         self.cache_dir = 'local_assets'
+        self.manifest_name = '.manifest.json'
+        self.manifest_lock = threading.Lock()
         self.ensure_cache_dir()
         
+    def connect(self):
+        """Import boto3 and create the S3 client and transfer settings"""
+        with self.client_lock:
+            if self.client is not None:
+                return
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+
+            # Configure boto3 with retries and timeouts
+            config = Config(
+                retries = dict(
+                    max_attempts = 3,
+                    mode = 'adaptive'
+                ),
+                connect_timeout = 5,
+                read_timeout = 10,
+                # One pooled connection per download, plus the parts of a ranged download
+                max_pool_connections = self.max_concurrency + MULTIPART_CONCURRENCY
+            )
+            self._transfer_config = TransferConfig(
+                multipart_threshold=MULTIPART_THRESHOLD,
+                multipart_chunksize=MULTIPART_CHUNKSIZE,
+                max_concurrency=MULTIPART_CONCURRENCY,
+                use_threads=True
+            )
+            self._upload_config = TransferConfig(
+                multipart_threshold=UPLOAD_PART_SIZE,
+                multipart_chunksize=UPLOAD_PART_SIZE,
+                max_concurrency=MULTIPART_CONCURRENCY,
+                use_threads=True
+            )
+            client = boto3.client('s3', config=config)
+            client.meta.events.register('after-call.s3', self.record_call)
+            client.meta.events.register('after-call-error.s3', self.record_call)
+            self.client = client
+
+    @property
+    def s3(self):
+        if self.client is None:
+            self.connect()
+        return self.client
+
+    @property
+    def transfer_config(self):
+        if self.client is None:
+            self.connect()
+        return self._transfer_config
+
+    @property
+    def upload_config(self):
+        if self.client is None:
+            self.connect()
+        return self._upload_config
+
     def ensure_cache_dir(self):
         """Ensure cache directory exists"""
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
+        self.blobs = get_blob_store(self.cache_dir)
+        self.remove_legacy_files()
+
+    def remove_legacy_files(self):
+        """Delete objects left at cache_dir/<key> by the flat cache layout the blob store replaced"""
+        cache_dir = os.path.abspath(self.cache_dir)
+        for key in set(self.load_manifest()) | set(ASSET_LEVELS) | set(SOURCE_NAMES):
+            path = os.path.abspath(os.path.join(cache_dir, key))
+            # Keys come from the bucket, so never follow one out of the cache directory
+            if os.path.commonpath([cache_dir, path]) == cache_dir and os.path.isfile(path):
+                with contextlib.suppress(OSError):
+                    os.remove(path)
             
     def is_available(self):
         """Check if S3 connection is available"""
+        # Only probe when the session has no verdict yet or the open circuit has cooled down
+        if not self.health.needs_probe():
+            return self.health.is_closed()
+
         try:
             self.s3.head_bucket(Bucket=self.bucket_name)
+            self.health.record_success()
             return True
         except Exception:
+            self.health.record_failure(trip=True)
             return False
 
+    def record_call(self, event_name, parsed=None, exception=None, **kwargs):
+        """Count an S3 call and the retries botocore's retry mode made for it"""
+        operation = event_name.rsplit('.', 1)[-1]
+        self.telemetry.count('s3_requests_total', operation=operation)
+        if exception is not None:
+            # Raised after the retries ran out; their count is not reported
+            self.telemetry.count('s3_request_errors_total', operation=operation)
+            return
+        retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        if retries:
+            self.telemetry.count('s3_retries_total', retries, operation=operation)
+
+    def record_error(self, error):
+        """Feed a request error into the health state"""
+        from botocore.exceptions import ClientError
+
+        # A client error means S3 answered; anything else is a connectivity problem
+        if not isinstance(error, ClientError):
+            self.health.record_failure()
+        self.telemetry.count('asset_errors_total',
+                             kind='client' if isinstance(error, ClientError) else 'connection')
+
+    def iter_asset_pages(self):
+        """Yield a list of (key, entry) for each page of the bucket listing"""
+        paginator = self.s3.get_paginator('list_objects_v2')
+        started = time.perf_counter()
+        for page in paginator.paginate(Bucket=self.bucket_name):
+            self.health.record_success()
+            self.telemetry.observe('asset_list_page_seconds', time.perf_counter() - started)
+            yield [(obj['Key'], {
+                'etag': obj['ETag'],
+                'size': obj['Size'],
+                'last_modified': obj['LastModified'].isoformat()
+            }) for obj in page.get('Contents', [])]
+            started = time.perf_counter()
+
+    def iter_asset_objects(self):
+        """Yield (key, entry) for every object in the bucket, one listing page at a time"""
+        for page in self.iter_asset_pages():
+            yield from page
+
     def list_assets(self):
         """List all assets in the S3 bucket"""
         if not self.is_available():
@@ -41,78 +354,505 @@ class GameAssetManager:
             return []
 
         try:
-            response = self.s3.list_objects_v2(Bucket=self.bucket_name)
-            if 'Contents' in response:
-                return [obj['Key'] for obj in response['Contents']]
-            return []
+            return [key for key, _ in self.iter_asset_objects()]
         except Exception as e:
+            self.record_error(e)
             print(f"Error listing assets: {e}")
             return []
 
+    def list_asset_objects(self):
+        """List all assets in the S3 bucket with their ETag, size and last-modified time"""
+        if not self.is_available():
+            print("S3 is not available")
+            return None
+
+        try:
+            return dict(self.iter_asset_objects())
+        except Exception as e:
+            self.record_error(e)
+            print(f"Error listing assets: {e}")
+            return None
+
+    def get_manifest_path(self):
+        """Get the local path of the sync manifest"""
+        return os.path.join(self.cache_dir, self.manifest_name)
+
+    def load_manifest(self):
+        """Load the manifest of assets fetched by the last sync"""
+        try:
+            with open(self.get_manifest_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        """Persist the manifest, replacing the previous one atomically"""
+        manifest_path = self.get_manifest_path()
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def update_manifest(self, synced, failed=(), listed=None):
+        """Merge sync results into the manifest on disk"""
+        # Several syncs may run at once (e.g. a level prefetch), so merge under the lock
+        with self.manifest_lock:
+            manifest = self.load_manifest()
+            if listed is not None:
+                # Drop entries that are no longer in the bucket
+                manifest = {key: entry for key, entry in manifest.items() if key in listed}
+            manifest.update(synced)
+            for key in failed:
+                manifest.pop(key, None)
+            self.save_manifest(manifest)
+
+    def is_asset_current(self, filename, entry, manifest):
+        """Check if the cached copy of an asset matches its remote entry"""
+        cached = manifest.get(filename)
+        # Entries written by a plain download_asset have no ETag to compare
+        if cached is None or 'etag' not in cached:
+            return False
+        if any(cached.get(field) != entry.get(field) for field in ('etag', 'size', 'last_modified')):
+            return False
+        return self.blobs.get(cached.get('sha256'), entry['size']) is not None
+
+    def stream_assets(self, max_workers=None, wanted=None, skip=None):
+        """Yield (filename, path) for each asset as soon as it is ready locally"""
+        # Listing pages are consumed lazily and changed objects download on the pool
+        # while listing continues; failed downloads are yielded with a path of None.
+        # wanted, if given, is a predicate selecting which keys to fetch, and skip maps
+        # the keys listed so far to those not worth fetching (e.g. atlas_covered).
+        # Downloads start in download_priority order, as many at once as the limiter allows.
+        if max_workers is None:
+            max_workers = self.max_concurrency
+
+        manifest = self.load_manifest()
+        synced = {}
+        failed = set()
+        listed = set()
+        listing_complete = False
+        ready = queue.Queue()
+        pending = 0
+        queued = []  # Heap of (priority, sequence, key, entry)
+        sequence = itertools.count()
+        started = time.perf_counter()
+
+        def finished(key, entry):
+            return lambda future: ready.put((key, entry, future))
+
+        def collect(key, entry, future):
+            try:
+                digest = future.result()
+            except Exception as e:
+                print(f"Error downloading {key}: {str(e)}")
+                digest = None
+            if digest is not None:
+                synced[key] = dict(entry, sha256=digest)
+                return key, self.blobs.path(digest)
+            failed.add(key)
+            return key, None
+
+        def submit_queued():
+            nonlocal pending
+            while queued and pending < min(self.limiter.limit, max_workers):
+                _, _, key, entry = heapq.heappop(queued)
+                future = executor.submit(self.fetch_measured, key, entry)
+                future.add_done_callback(finished(key, entry))
+                pending += 1
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            try:
+                for page in self.iter_asset_pages():
+                    listed.update(key for key, _ in page)
+                    skipped = skip(listed) if skip is not None else ()
+                    for key, entry in page:
+                        if key in skipped or (wanted is not None and not wanted(key)):
+                            continue
+                        if self.is_asset_current(key, entry, manifest):
+                            self.telemetry.count('asset_cache_hits_total', phase='sync')
+                            synced[key] = manifest[key]
+                            yield key, self.blobs.path(manifest[key]['sha256'])
+                        else:
+                            self.telemetry.count('asset_cache_misses_total', phase='sync')
+                            heapq.heappush(queued, (download_priority(key, entry['size']),
+                                                    next(sequence), key, entry))
+                    submit_queued()
+
+                    # Hand over downloads that finished while we were listing
+                    while not ready.empty():
+                        pending -= 1
+                        yield collect(*ready.get())
+                        submit_queued()
+                listing_complete = True
+            except Exception as e:
+                self.record_error(e)
+                print(f"Error listing assets: {e}")
+
+            submit_queued()
+            while pending:
+                pending -= 1
+                yield collect(*ready.get())
+                submit_queued()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.update_manifest(synced, failed, listed if listing_complete else None)
+            self.telemetry.observe('asset_batch_seconds', time.perf_counter() - started, phase='sync')
+
+    def sync_assets(self):
+        """Download only the assets that are new or changed since the last sync"""
+        # The listing itself proves the bucket is reachable, so no HeadBucket probe;
+        # only a circuit already known to be open skips the round trip
+        if not self.health.is_closed() and not self.health.needs_probe():
+            print("S3 is not available")
+            return None
+
+        return dict(self.stream_assets())
+
     def is_asset_cached(self, filename):
-        """Check if asset exists in local cache"""
-        cache_path = os.path.join(self.cache_dir, filename)
-        return os.path.exists(cache_path)
+        """Check if an intact copy of the asset is in the local cache"""
+        return self.get_cached_path(filename) is not None
 
     def get_cached_path(self, filename):
-        """Get the local path for a cached asset"""
-        return os.path.join(self.cache_dir, filename)
+        """Get the verified local path for a cached asset, or None if it is not cached"""
+        entry = self.load_manifest().get(filename)
+        if entry is None:
+            return None
+        return self.blobs.get(entry.get('sha256'), entry.get('size'))
 
-    def download_asset(self, filename, force_download=False):
-        """Download a game asset from S3 with caching"""
-        cache_path = os.path.join(self.cache_dir, filename)
-        
-        # Return cached version if it exists and force_download is False
-        if not force_download and self.is_asset_cached(filename):
-            return cache_path
+    def get_cached_assets(self, wanted=None):
+        """Get verified local paths for the assets of the last sync without touching S3"""
+        # None means the cache cannot stand in for a sync: never synced, or something
+        # wanted is missing or corrupt
+        manifest = self.load_manifest()
+        paths = {}
+        for key, entry in manifest.items():
+            if wanted is not None and not wanted(key):
+                continue
+            path = self.blobs.get(entry.get('sha256'), entry.get('size'))
+            if path is None:
+                self.telemetry.count('asset_cache_misses_total', phase='fast_start')
+                return None
+            paths[key] = path
+        if not paths:
+            self.telemetry.count('asset_cache_misses_total', phase='fast_start')
+            return None
+        self.telemetry.count('asset_cache_hits_total', len(paths), phase='fast_start')
+        return paths
+
+    def download_object(self, filename, path, entry=None):
+        """Download an object to path without a HeadObject first"""
+        # Small objects, and any without a listing entry, take a single GET; large ones
+        # download as parallel ranged parts, sized and pinned to the listed ETag
+        if entry is None or entry['size'] < MULTIPART_THRESHOLD:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=filename)
+            with open(path, 'wb') as f:
+                for chunk in response['Body'].iter_chunks(1024 * 1024):
+                    f.write(chunk)
+            return
+        from boto3.s3.transfer import create_transfer_manager
+
+        with create_transfer_manager(self.s3, self.transfer_config) as manager:
+            manager.download(self.bucket_name, filename, path,
+                             subscribers=[ProvideListing(entry)]).result()
 
+    def fetch_blob(self, filename, entry=None):
+        """Download an object into the blob store and return its digest, or None on failure"""
         if not self.is_available():
             print("S3 is not available")
             return None
 
+        # Download beside the store and rename into place, so a crash leaves no partial blob
+        tmp_path = self.blobs.temp_path()
         try:
-            # Ensure the directory structure exists
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            
-            # Download the file
-            self.s3.download_file(self.bucket_name, filename, cache_path)
-            return cache_path
+            started = time.perf_counter()
+            self.download_object(filename, tmp_path, entry)
+            self.telemetry.observe('asset_download_seconds', time.perf_counter() - started, asset=filename)
+            self.telemetry.count('asset_download_bytes_total', os.path.getsize(tmp_path), asset=filename)
+            digest = self.blobs.commit(tmp_path)
+            self.health.record_success()
+            return digest
         except Exception as e:
+            self.record_error(e)
+            self.telemetry.count('asset_download_failures_total', asset=filename)
             print(f"Error downloading {filename}: {str(e)}")
             return None
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def fetch_measured(self, filename, entry=None):
+        """fetch_blob, reporting the transfer's size and duration to the concurrency limiter"""
+        started = time.monotonic()
+        digest = self.fetch_blob(filename, entry)
+        if digest is not None:
+            size = entry['size'] if entry is not None else os.path.getsize(self.blobs.path(digest))
+            self.limiter.record(size, started, time.monotonic())
+        return digest
+
+    def download_asset(self, filename, force_download=False, entry=None):
+        """Download a game asset from S3 with caching"""
+        # Return cached version if it exists and force_download is False
+        if not force_download:
+            cache_path = self.get_cached_path(filename)
+            if cache_path is not None:
+                self.telemetry.count('asset_cache_hits_total', phase='download')
+                return cache_path
+            self.telemetry.count('asset_cache_misses_total', phase='download')
+
+        digest = self.fetch_measured(filename, entry)
+        if digest is None:
+            return None
+        cache_path = self.blobs.path(digest)
+        # No listing entry here, so the next sync re-checks this key against the bucket
+        self.update_manifest({filename: {'sha256': digest, 'size': os.path.getsize(cache_path)}})
+        return cache_path
+
+    def download_bundle(self, bundle_name='assets.bundle'):
+        """Fetch the packed asset bundle with a single conditional GET"""
+        from botocore.exceptions import ClientError
 
-    def download_assets_parallel(self, filenames, max_workers=4):
+        manifest = self.load_manifest()
+        entry = manifest.get(bundle_name)
+        is_cached = entry is not None and self.is_asset_current(bundle_name, entry, manifest)
+        cache_path = self.blobs.path(entry['sha256']) if is_cached else None
+
+        # While the circuit is open, make do with the copy we already have
+        if not self.health.is_closed() and not self.health.needs_probe():
+            if cache_path is not None:
+                self.telemetry.count('asset_cache_hits_total', phase='bundle')
+            return cache_path
+
+        request = {'Bucket': self.bucket_name, 'Key': bundle_name}
+        if is_cached:
+            request['IfNoneMatch'] = entry['etag']
+
+        try:
+            started = time.perf_counter()
+            response = self.s3.get_object(**request)
+            tmp_path = self.blobs.temp_path()
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response['Body'].iter_chunks(1024 * 1024):
+                        f.write(chunk)
+                self.telemetry.observe('asset_download_seconds', time.perf_counter() - started,
+                                       asset=bundle_name)
+                self.telemetry.count('asset_download_bytes_total', os.path.getsize(tmp_path),
+                                     asset=bundle_name)
+                digest = self.blobs.commit(tmp_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.health.record_success()
+            self.telemetry.count('asset_cache_misses_total', phase='bundle')
+        except ClientError as e:
+            self.health.record_success()
+            if e.response['Error']['Code'] in ('304', 'NotModified'):
+                self.telemetry.count('asset_cache_hits_total', phase='bundle')
+                return cache_path
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+                print(f"Error downloading {bundle_name}: {str(e)}")
+            return None
+        except Exception as e:
+            self.record_error(e)
+            print(f"Error downloading {bundle_name}: {str(e)}")
+            return cache_path
+
+        self.update_manifest({bundle_name: {
+            'etag': response['ETag'],
+            'size': response['ContentLength'],
+            'last_modified': response['LastModified'].isoformat(),
+            'sha256': digest
+        }})
+        return self.blobs.path(digest)
+
+    def download_assets_parallel(self, filenames, max_workers=None, force_download=False, entries=None):
         """Download multiple assets in parallel"""
+        # Assets start in download_priority order (entries, if known, maps name -> listing
+        # entry), as many at once as the concurrency limiter currently allows
+        if max_workers is None:
+            max_workers = self.max_concurrency
+        entries = entries or {}
+        waiting = sorted(filenames, key=lambda filename: download_priority(
+            filename, entries[filename]['size'] if filename in entries else 0))
+        waiting.reverse()  # Pop from the end
+
         def download_single(filename):
-            return self.download_asset(filename)
+            return self.download_asset(filename, force_download=force_download,
+                                       entry=entries.get(filename))
 
+        started = time.perf_counter()
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_filename = {executor.submit(download_single, filename): filename 
-                                for filename in filenames}
-            
+            running = {}
             results = {}
-            for future in concurrent.futures.as_completed(future_to_filename):
-                filename = future_to_filename[future]
-                try:
-                    results[filename] = future.result()
-                except Exception as e:
-                    print(f"Error downloading {filename}: {str(e)}")
-                    results[filename] = None
-                    
-            return results
-
-    def create_asset_cache(self, cache_dir='local_assets'):
+            while waiting or running:
+                while waiting and len(running) < min(self.limiter.limit, max_workers):
+                    filename = waiting.pop()
+                    running[executor.submit(download_single, filename)] = filename
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    filename = running.pop(future)
+                    try:
+                        results[filename] = future.result()
+                    except Exception as e:
+                        print(f"Error downloading {filename}: {str(e)}")
+                        results[filename] = None
+
+        self.telemetry.observe('asset_batch_seconds', time.perf_counter() - started, phase='parallel')
+        return results
+
+    def upload_asset(self, path, key, cache_control=UPLOAD_CACHE_CONTROL):
+        """Upload one file, in parallel parts if it is large, with long-lived cache headers"""
+        extra_args = {'CacheControl': cache_control}
+        content_type, _ = mimetypes.guess_type(key)
+        if content_type:
+            extra_args['ContentType'] = content_type
+        try:
+            self.s3.upload_file(path, self.bucket_name, key, ExtraArgs=extra_args,
+                                Config=self.upload_config)
+            self.health.record_success()
+            return True
+        except Exception as e:
+            self.record_error(e)
+            print(f"Error uploading {key}: {str(e)}")
+            return False
+
+    def upload_assets(self, asset_dir, max_workers=None, cache_control=UPLOAD_CACHE_CONTROL):
+        """Upload the files in asset_dir whose content differs from the bucket's copy"""
+        # One listing gives every remote ETag; only files whose locally computed ETag
+        # differs are uploaded. Returns {key: 'uploaded' | 'unchanged' | 'failed'}.
+        if max_workers is None:
+            max_workers = self.max_concurrency
+        remote = self.list_asset_objects()
+        if remote is None:
+            return None
+
+        local = {}
+        for root, _, files in os.walk(asset_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                local[os.path.relpath(path, asset_dir).replace(os.sep, '/')] = path
+
+        results = {}
+        changed = []
+        for key, path in sorted(local.items()):
+            entry = remote.get(key)
+            if (entry is not None and entry['size'] == os.path.getsize(path) and
+                    entry['etag'].strip('"') == expected_etag(path, self.upload_config)):
+                results[key] = 'unchanged'
+            else:
+                changed.append(key)
+
+        # Largest first, so a big file does not start last and finish alone
+        changed.sort(key=lambda key: os.path.getsize(local[key]), reverse=True)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.upload_asset, local[key], key, cache_control): key
+                       for key in changed}
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = 'uploaded' if future.result() else 'failed'
+        return results
+
+    def run_async(self, func, *args):
+        """Run a blocking call on the manager's worker pool and await its result"""
+        # Lets the game keep rendering (and pygbag keep yielding) while S3 is busy
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def is_available_async(self):
+        """Async variant of is_available"""
+        return await self.run_async(self.is_available)
+
+    async def download_asset_async(self, filename, force_download=False):
+        """Async variant of download_asset"""
+        return await self.run_async(self.download_asset, filename, force_download)
+
+    async def download_assets_async(self, filenames, force_download=False):
+        """Download multiple assets concurrently without blocking the event loop"""
+        paths = await asyncio.gather(
+            *(self.download_asset_async(filename, force_download) for filename in filenames),
+            return_exceptions=True)
+        results = {}
+        for filename, path in zip(filenames, paths):
+            if isinstance(path, Exception):
+                print(f"Error downloading {filename}: {str(path)}")
+                path = None
+            results[filename] = path
+        return results
+
+    async def download_bundle_async(self, bundle_name='assets.bundle'):
+        """Async variant of download_bundle"""
+        return await self.run_async(self.download_bundle, bundle_name)
+
+    async def stream_assets_async(self, wanted=None, skip=None):
+        """Async variant of stream_assets, yielding assets as they become ready"""
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Queue()
+        done = object()
+
+        def produce():
+            try:
+                for item in self.stream_assets(wanted=wanted, skip=skip):
+                    loop.call_soon_threadsafe(ready.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(ready.put_nowait, done)
+
+        # The producer gets its own thread so it never competes with its own downloads
+        producer = loop.run_in_executor(None, produce)
+        while True:
+            item = await ready.get()
+            if item is done:
+                break
+            yield item
+        await producer
+
+    def create_asset_cache(self, cache_dir='local_assets', sync=True):
         """Create a local cache of all game assets"""
         self.cache_dir = cache_dir
         self.ensure_cache_dir()
-        
+
+        if sync:
+            # Diff the bucket listing against the manifest and fetch only what changed
+            results = self.sync_assets()
+            if not results:
+                return False
+            return all(path is not None for path in results.values())
+
         # Get list of all assets
-        assets = self.list_assets()
-        if not assets:
+        objects = self.list_asset_objects()
+        if not objects:
             return False
             
         # Download all assets in parallel
-        results = self.download_assets_parallel(assets)
+        results = self.download_assets_parallel(
+            list(objects), entries=objects)
         
         # Check if all downloads were successful
-        return all(path is not None for path in results.values())
\ No newline at end of file
+        return all(path is not None for path in results.values())
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Publish game assets to the S3 bucket in S3_BUCKET_NAME")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    upload = subcommands.add_parser('upload', help="upload new and changed files")
+    upload.add_argument('asset_dir', nargs='?', default='assets')
+    upload.add_argument('--workers', type=int, default=MAX_DOWNLOAD_CONCURRENCY)
+    upload.add_argument('--cache-control', default=UPLOAD_CACHE_CONTROL)
+    args = parser.parse_args()
+
+    manager = GameAssetManager()
+    if not manager.is_available():
+        raise SystemExit(f"Bucket {manager.bucket_name} is not available")
+    results = manager.upload_assets(args.asset_dir, args.workers, args.cache_control)
+    if results is None:
+        raise SystemExit("Could not list the bucket")
+    for key, status in sorted(results.items()):
+        if status != 'unchanged':
+            print(f"{status:>9} {key}")
+    counts = {status: list(results.values()).count(status) for status in ('uploaded', 'unchanged', 'failed')}
+    print(f"{counts['uploaded']} uploaded, {counts['unchanged']} unchanged, {counts['failed']} failed")
+    if counts['failed']:
+        raise SystemExit(1)
@@ -0,0 +1,85 @@
+import os
+
+# Draw size and pixel format of every image the game blits, matching main.py.
+# Opaque images (the JPG backgrounds) are kept without per-pixel alpha.
+ASSET_SPECS = {
+    'hero.png': {'size': (40, 60), 'opaque': False},
+    'witch.png': {'size': (50, 70), 'opaque': False},
+    'heart.png': {'size': (30, 30), 'opaque': False},
+    # pool_width x (pool_height + 10), slightly taller for a depth effect
+    'pothole.png': {'size': (80, 30), 'opaque': False},
+    'day_background1.jpg': {'size': (800, 400), 'opaque': True},
+    'night_background.JPG': {'size': (800, 400), 'opaque': True},
+}
+
+# Fixed-size sprites packed at their draw sizes into one texture by sprite_atlas.py.
+# Animation frames can be added here (and to ASSET_SPECS) without new downloads.
+ATLAS_NAME = 'sprites.atlas.png'
+ATLAS_INDEX_NAME = 'sprites.atlas.json'
+ATLAS_SPRITES = ['hero.png', 'witch.png', 'heart.png', 'pothole.png']
+
+# Long tracks streamed through pygame.mixer.music when played; every other sound
+# is decoded up front into a Sound.
+STREAMED_AUDIO = {'bckground.mp3'}
+
+# Output format of each asset in the optimized build (build_assets.py). Images are
+# written at their ASSET_SPECS draw size: sprites as lossless PNG, the opaque
+# backgrounds as JPEG. Sounds are re-encoded to OGG Vorbis.
+BUILD_FORMATS = {
+    'hero.png': 'png',
+    'witch.png': 'png',
+    'heart.png': 'png',
+    'pothole.png': 'png',
+    'day_background1.jpg': 'jpg',
+    'night_background.JPG': 'jpg',
+    'audio.mp3': 'ogg',
+    'bckground.mp3': 'ogg',
+}
+
+
+def build_name(asset_file):
+    """Get the file name build_assets.py writes an asset to"""
+    stem, ext = os.path.splitext(asset_file)
+    output_format = BUILD_FORMATS.get(asset_file)
+    if output_format is None or ext[1:].lower() == output_format:
+        return asset_file
+    return f"{stem}.{output_format}"
+
+
+# Built outputs are looked up in game.assets under their source names
+SOURCE_NAMES = {build_name(asset_file): asset_file for asset_file in BUILD_FORMATS}
+
+
+def runtime_name(asset_file):
+    """Get the name the game stores an asset under, mapping built outputs to their sources"""
+    return SOURCE_NAMES.get(asset_file, asset_file)
+
+
+# First level that needs each asset. Anything not listed is treated as level 1;
+# later levels are prefetched in the background while level 1 is playing.
+ASSET_LEVELS = {
+    'hero.png': 1,
+    'heart.png': 1,
+    'pothole.png': 1,
+    'day_background1.jpg': 1,
+    'audio.mp3': 1,
+    'bckground.mp3': 1,
+    # The atlas carries every sprite, level 2's witch included
+    ATLAS_NAME: 1,
+    ATLAS_INDEX_NAME: 1,
+    'witch.png': 2,
+    'night_background.JPG': 2,
+}
+
+
+def atlas_covered(names):
+    """Get the names whose sprite is already in an atlas that names also includes"""
+    names = set(names)
+    if ATLAS_NAME not in names or ATLAS_INDEX_NAME not in names:
+        return set()
+    return {name for name in names if runtime_name(name) in ATLAS_SPRITES}
+
+
+def asset_level(asset_file):
+    """Get the first level that needs an asset"""
+    return ASSET_LEVELS.get(runtime_name(asset_file), 1)
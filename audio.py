@@ -0,0 +1,94 @@
+import contextlib
+import os
+import pygame
+
+
+class SoundCache:
+    """Persisted decoded PCM for short effects, keyed by source hash and mixer format"""
+    def __init__(self, cache_dir='local_assets/sounds'):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, source_hash, mixer_format):
+        """Get the cache file path for a sound decoded to the mixer's format"""
+        frequency, size, channels = mixer_format
+        return os.path.join(self.cache_dir, f"{source_hash}_{frequency}_{size}_{channels}.pcm")
+
+    def load(self, source_hash):
+        """Load a cached sound for the current mixer format, or None on a miss"""
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return None
+        path = self.get_path(source_hash, mixer_format)
+        try:
+            with open(path, 'rb') as f:
+                pcm = f.read()
+        except OSError:
+            return None
+        # Record the use; the blob store evicts these least recently used first
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+        # A truncated file is a miss, not an error
+        frequency, size, channels = mixer_format
+        if not pcm or len(pcm) % (abs(size) // 8 * channels):
+            return None
+        return pygame.mixer.Sound(buffer=pcm)
+
+    def store(self, source_hash, sound):
+        """Persist a sound's decoded PCM"""
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return
+        path = self.get_path(source_hash, mixer_format)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(sound.get_raw())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to cache sound {path}: {e}")
+
+    def get(self, source_hash, decode):
+        """Get a playable sound, decoding the source only on a miss"""
+        sound = self.load(source_hash)
+        if sound is not None:
+            return sound
+
+        sound = decode()
+        self.store(source_hash, sound)
+        return sound
+
+
+class MusicTrack:
+    """A long track streamed through pygame.mixer.music instead of decoded into memory"""
+    def __init__(self, name, path=None, bundle=None):
+        self.name = name
+        self.path = path
+        self.bundle = bundle
+        self.stream = None
+
+    def play(self, loops=-1):
+        """Start streaming the track from the cache or the bundle"""
+        if self.bundle is not None:
+            # The mixer keeps reading from the file object while the track plays
+            stream = self.bundle.open(self.name)
+            pygame.mixer.music.load(stream, self.name)
+            # Loading frees the mixer's previous track, so its stream can be closed now
+            self.close()
+            self.stream = stream
+        else:
+            pygame.mixer.music.load(self.path)
+        pygame.mixer.music.play(loops)
+
+    def close(self):
+        """Release the bundle slice the last play() streamed from"""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def set_volume(self, volume):
+        pygame.mixer.music.set_volume(volume)
+
+    def stop(self):
+        pygame.mixer.music.stop()
@@ -0,0 +1,299 @@
+import concurrent.futures
+import os
+import numpy as np
+from simulation import (WINDOW_WIDTH, FLOOR_HEIGHT, STEP_SCALE, player_height, player_width,
+                        pool_width, pool_height, jump_speed, gravity)
+
+PLAYER_X = 100
+POOL_Y = FLOOR_HEIGHT - pool_height
+ADVERSARY_WIDTH = 50
+ADVERSARY_HEIGHT = 70
+ADVERSARY_SPEED = 5
+ADVERSARY_JUMP_SPEED = -15
+ADVERSARY_GRAVITY = 0.8
+INVULNERABLE_DURATION = 2000
+
+
+def _per_env(value, num_envs, dtype=np.float64):
+    """Broadcast a scalar or per-environment parameter to one value per game"""
+    return np.broadcast_to(np.asarray(value, dtype=dtype), (num_envs,)).copy()
+
+
+class BatchGameEnv:
+    """N independent games stepped in lockstep, with the same rules as GameSimulation"""
+    # Finished games are recorded in results and restarted on the next step, so the
+    # batch always stays full. Tunable parameters accept a scalar or one value per game.
+    def __init__(self, num_envs, seed=None, step_scale=STEP_SCALE, level_length=5000,
+                 game_speed=5, pool_spacing=300, adversary_spacing=400,
+                 jump_interval=(60, 120), max_level=3, lives=3):
+        n = self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.step_scale = step_scale
+        self.step_ms = step_scale * 1000 / 60
+
+        self.level_length = _per_env(level_length, n)
+        self.game_speed = _per_env(game_speed, n)
+        self.pool_spacing = _per_env(pool_spacing, n)
+        self.adversary_spacing = _per_env(adversary_spacing, n)
+        self.jump_interval_min = _per_env(jump_interval[0], n, np.int64)
+        self.jump_interval_max = _per_env(jump_interval[1], n, np.int64)
+        self.max_level = _per_env(max_level, n, np.int64)
+        self.start_lives = _per_env(lives, n, np.int64)
+
+        # Enough obstacle slots for the densest spacing on screen at once
+        self.max_pools = int((WINDOW_WIDTH + pool_width) // self.pool_spacing.min()) + 2
+        self.max_adversaries = int((WINDOW_WIDTH + ADVERSARY_WIDTH) // self.adversary_spacing.min()) + 2
+
+        self.time_ms = np.zeros(n)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.level = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int64)
+        self.distance = np.zeros(n)
+        self.invulnerable = np.zeros(n, dtype=bool)
+        self.invulnerable_timer = np.zeros(n)
+
+        self.player_y = np.zeros(n)
+        self.player_velocity_y = np.zeros(n)
+        self.is_jumping = np.zeros(n, dtype=bool)
+
+        self.pool_x = np.zeros((n, self.max_pools))
+        self.pool_active = np.zeros((n, self.max_pools), dtype=bool)
+        self.last_pool_x = np.full(n, -np.inf)
+
+        shape = (n, self.max_adversaries)
+        self.adversary_x = np.zeros(shape)
+        self.adversary_y = np.zeros(shape)
+        self.adversary_velocity_y = np.zeros(shape)
+        self.adversary_jump_timer = np.zeros(shape)
+        self.adversary_jump_interval = np.zeros(shape, dtype=np.int64)
+        self.adversary_active = np.zeros(shape, dtype=bool)
+        self.last_adversary_x = np.full(n, -np.inf)
+
+        # Per finished episode: final level, steps played, lives left, whether it was won
+        self.results = {'level': [], 'steps': [], 'lives': [], 'victory': []}
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games in the selected environments (all by default)"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        self.time_ms[mask] = 0
+        self.steps[mask] = 0
+        self.level[mask] = 1
+        self.lives[mask] = self.start_lives[mask]
+        self.distance[mask] = 0
+        self.invulnerable[mask] = False
+        self.invulnerable_timer[mask] = 0
+        self.player_y[mask] = FLOOR_HEIGHT - player_height
+        self.player_velocity_y[mask] = 0
+        self.is_jumping[mask] = False
+        self.clear_obstacles(mask)
+
+    def clear_obstacles(self, mask):
+        self.pool_active[mask] = False
+        self.last_pool_x[mask] = -np.inf
+        self.adversary_active[mask] = False
+        self.last_adversary_x[mask] = -np.inf
+
+    def lose_life(self, mask):
+        """Apply a hit to the selected games; returns the ones that are now over"""
+        self.lives[mask] -= 1
+        self.invulnerable[mask] = True
+        self.invulnerable_timer[mask] = self.time_ms[mask]
+        game_over = mask & (self.lives <= 0)
+        respawn = mask & ~game_over
+        self.player_y[respawn] = FLOOR_HEIGHT - player_height
+        self.player_velocity_y[respawn] = 0
+        return game_over
+
+    def step(self, jump):
+        """Advance every game by one fixed step; returns the mask of games that ended"""
+        scale = self.step_scale
+        rows = np.arange(self.num_envs)
+        self.steps += 1
+        self.time_ms += self.step_ms
+
+        # Update game state
+        self.distance += self.game_speed * scale
+        pool_level = (self.level == 1) | (self.level == 3)
+        adversary_level = self.level >= 2
+
+        # Generate water pools (only in levels 1 and 3)
+        pool_count = self.pool_active.sum(axis=1)
+        spawn = pool_level & ((pool_count == 0) | (self.last_pool_x < WINDOW_WIDTH - self.pool_spacing))
+        if spawn.any():
+            slot = np.argmin(self.pool_active[spawn], axis=1)
+            self.pool_x[rows[spawn], slot] = WINDOW_WIDTH
+            self.pool_active[rows[spawn], slot] = True
+            self.last_pool_x[spawn] = WINDOW_WIDTH
+
+        # Generate adversaries (only in levels 2 and 3)
+        adversary_count = self.adversary_active.sum(axis=1)
+        spawn = adversary_level & ((adversary_count == 0) |
+                                   (self.last_adversary_x < WINDOW_WIDTH - self.adversary_spacing))
+        if spawn.any():
+            idx = rows[spawn]
+            slot = np.argmin(self.adversary_active[spawn], axis=1)
+            self.adversary_x[idx, slot] = WINDOW_WIDTH
+            self.adversary_y[idx, slot] = FLOOR_HEIGHT - ADVERSARY_HEIGHT
+            self.adversary_velocity_y[idx, slot] = 0
+            self.adversary_jump_timer[idx, slot] = 0
+            self.adversary_jump_interval[idx, slot] = self.rng.integers(
+                self.jump_interval_min[spawn], self.jump_interval_max[spawn] + 1)
+            self.adversary_active[idx, slot] = True
+            self.last_adversary_x[spawn] = WINDOW_WIDTH
+
+        # Update pools and adversaries
+        self.pool_x -= (self.game_speed * scale)[:, None]
+        self.last_pool_x -= self.game_speed * scale
+        self.pool_active &= self.pool_x > -pool_width
+
+        active = self.adversary_active
+        self.adversary_x[active] -= ADVERSARY_SPEED * scale
+        self.last_adversary_x -= ADVERSARY_SPEED * scale
+        self.adversary_jump_timer[active] += scale
+        jumps = active & (self.adversary_jump_timer >= self.adversary_jump_interval)
+        if jumps.any():
+            self.adversary_jump_timer[jumps] = 0
+            low = np.broadcast_to(self.jump_interval_min[:, None], jumps.shape)[jumps]
+            high = np.broadcast_to(self.jump_interval_max[:, None], jumps.shape)[jumps]
+            self.adversary_jump_interval[jumps] = self.rng.integers(low, high + 1)
+            self.adversary_velocity_y[jumps] = ADVERSARY_JUMP_SPEED
+        self.adversary_y[active] += self.adversary_velocity_y[active] * scale
+        self.adversary_velocity_y[active] += ADVERSARY_GRAVITY * scale
+        landed = active & (self.adversary_y >= FLOOR_HEIGHT - ADVERSARY_HEIGHT)
+        self.adversary_y[landed] = FLOOR_HEIGHT - ADVERSARY_HEIGHT
+        self.adversary_velocity_y[landed] = 0
+        self.adversary_active &= self.adversary_x > -ADVERSARY_WIDTH
+
+        # Level transition
+        reached = self.distance >= self.level_length
+        level_up = reached & (self.level < self.max_level)
+        victory = reached & ~level_up
+        if level_up.any():
+            self.level[level_up] += 1
+            self.distance[level_up] = 0
+            self.clear_obstacles(level_up)
+
+        # Apply this step's input
+        jumping = np.asarray(jump, dtype=bool) & ~self.is_jumping
+        self.player_velocity_y[jumping] = jump_speed
+        self.is_jumping |= jumping
+
+        # Update player position
+        self.player_y += self.player_velocity_y * scale
+        self.player_velocity_y += gravity * scale
+
+        # Ground collision
+        grounded = self.player_y >= FLOOR_HEIGHT - player_height
+        self.player_y[grounded] = FLOOR_HEIGHT - player_height
+        self.player_velocity_y[grounded] = 0
+        self.is_jumping &= ~grounded
+
+        # Pool collisions (only in levels 1 and 3), with a 10px margin for realism
+        in_pool = (self.pool_active &
+                   (PLAYER_X + player_width > self.pool_x + 10) &
+                   (PLAYER_X < self.pool_x + pool_width - 10) &
+                   (self.player_y + player_height > POOL_Y)[:, None])
+        hit = pool_level & ~self.invulnerable & in_pool.any(axis=1)
+        game_over = self.lose_life(hit)
+
+        # Adversary collisions (only in levels 2 and 3); same overlap test as pygame.Rect
+        player_y = np.trunc(self.player_y)[:, None]
+        adversary_x = np.trunc(self.adversary_x)
+        adversary_y = np.trunc(self.adversary_y)
+        touching = (self.adversary_active &
+                    (PLAYER_X < adversary_x + ADVERSARY_WIDTH) &
+                    (adversary_x < PLAYER_X + player_width) &
+                    (player_y < adversary_y + ADVERSARY_HEIGHT) &
+                    (adversary_y < player_y + player_height))
+        hit = adversary_level & ~self.invulnerable & touching.any(axis=1)
+        game_over |= self.lose_life(hit)
+
+        expired = self.invulnerable & (self.time_ms - self.invulnerable_timer >= INVULNERABLE_DURATION)
+        self.invulnerable &= ~expired
+
+        done = game_over | victory
+        if done.any():
+            self.results['level'].append(self.level[done].copy())
+            self.results['steps'].append(self.steps[done].copy())
+            self.results['lives'].append(np.maximum(self.lives[done], 0))
+            self.results['victory'].append(victory[done] & ~game_over[done])
+            self.reset(done)
+        return done
+
+    def nearest_obstacle_distance(self):
+        """Distance from the player to the closest pool or adversary ahead of them"""
+        pool_dx = np.where(self.pool_active & (self.pool_x > PLAYER_X), self.pool_x - PLAYER_X, np.inf)
+        adversary_dx = np.where(self.adversary_active & (self.adversary_x > PLAYER_X),
+                                self.adversary_x - PLAYER_X, np.inf)
+        return pool_dx.min(axis=1), adversary_dx.min(axis=1)
+
+    def observe(self):
+        """Per-game feature rows for automated players"""
+        pool_dx, adversary_dx = self.nearest_obstacle_distance()
+        return np.stack([self.player_y, self.player_velocity_y, self.is_jumping,
+                         np.minimum(pool_dx, WINDOW_WIDTH), np.minimum(adversary_dx, WINDOW_WIDTH),
+                         self.level, self.lives, self.invulnerable], axis=1)
+
+    def episode_results(self):
+        """Concatenate the results of every finished game"""
+        return {key: np.concatenate(values) if values else np.zeros(0)
+                for key, values in self.results.items()}
+
+
+def jump_before_obstacles(env):
+    """Vectorized version of simulation.jump_before_pools"""
+    pool_dx, adversary_dx = env.nearest_obstacle_distance()
+    return (pool_dx < 60) | (adversary_dx < 80)
+
+
+def run_shard(num_episodes, num_envs=1024, seed=None, **params):
+    """Play at least num_episodes games in one process and return their results"""
+    env = BatchGameEnv(min(num_envs, num_episodes), seed=seed, **params)
+    finished = 0
+    while finished < num_episodes:
+        finished += int(env.step(jump_before_obstacles(env)).sum())
+    return {key: values[:num_episodes] for key, values in env.episode_results().items()}
+
+
+def run_sweep(num_episodes, num_envs=1024, processes=None, seed=0, **params):
+    """Play num_episodes games, optionally sharded across a process pool"""
+    processes = processes or 1
+    shards = [num_episodes // processes + (1 if i < num_episodes % processes else 0)
+              for i in range(processes)]
+    shards = [size for size in shards if size]
+    if len(shards) == 1:
+        parts = [run_shard(shards[0], num_envs, seed, **params)]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(run_shard, size, num_envs, seed + i, **params)
+                       for i, size in enumerate(shards)]
+            parts = [future.result() for future in futures]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sweep difficulty settings over many batched games")
+    parser.add_argument('--episodes', type=int, default=10000)
+    parser.add_argument('--envs', type=int, default=1024, help="games stepped together per process")
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--level-length', type=float, default=5000)
+    parser.add_argument('--game-speed', type=float, default=5)
+    parser.add_argument('--pool-spacing', type=float, default=300)
+    parser.add_argument('--jump-interval', type=int, nargs=2, default=(60, 120))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_sweep(args.episodes, args.envs, args.processes, args.seed,
+                        level_length=args.level_length, game_speed=args.game_speed,
+                        pool_spacing=args.pool_spacing, jump_interval=tuple(args.jump_interval))
+    elapsed = time.perf_counter() - start
+    levels, counts = np.unique(results['level'], return_counts=True)
+    print(f"{len(results['level'])} episodes, {int(results['steps'].sum())} steps in {elapsed:.2f}s")
+    print("Final level reached:", dict(zip(levels.tolist(), counts.tolist())))
+    print(f"Victory rate: {results['victory'].mean():.3f}, mean steps: {results['steps'].mean():.0f}")
@@ -0,0 +1,4 @@
+"""Headless benchmarks for startup, asset loading and per-frame cost
+
+Run from the project root with ``python -m benchmarks``; see ``--help``.
+"""
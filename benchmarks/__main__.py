@@ -0,0 +1,114 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from benchmarks.harness import REPO_DIR, LocalS3, WorkDir, setup_environment
+
+SUITES = ('startup', 'throughput', 'adaptive', 'decode', 'frames')
+
+
+def git_commit():
+    """Get the commit being benchmarked, if this is a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=''):
+    """Yield (dotted path, value) for every number in a results tree"""
+    if isinstance(results, dict):
+        for key, value in results.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(results, list):
+        for i, value in enumerate(results):
+            yield from flatten(value, f"{prefix}[{i}]")
+    elif isinstance(results, (int, float)) and not isinstance(results, bool):
+        yield prefix, results
+
+
+def compare(baseline, current, threshold):
+    """Print timings that got slower than the baseline by more than threshold"""
+    old = dict(flatten(baseline['results']))
+    regressions = 0
+    for path, value in flatten(current['results']):
+        if not path.endswith('_ms') or not old.get(path):
+            continue
+        ratio = value / old[path]
+        if ratio > 1 + threshold:
+            regressions += 1
+            print(f"  {path}: {old[path]:.3f} -> {value:.3f} ms ({ratio:.2f}x)")
+    print(f"{regressions} timings regressed by more than {threshold:.0%} against "
+          f"{baseline['meta'].get('commit') or 'the baseline'}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmark startup, asset loading and frame cost headlessly")
+    parser.add_argument('--only', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--repeat', type=int, default=5, help="warm runs per startup scenario")
+    parser.add_argument('--frames', type=int, default=600, help="frames per stress scenario")
+    parser.add_argument('--copies', type=int, default=8, help="copies of assets/ in the throughput bucket")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--latency-ms', type=int, nargs='+', default=[0, 50, 200],
+                        help="per-request latency injected in the adaptive suite")
+    parser.add_argument('--compare', metavar='BASELINE', help="report regressions against an earlier results file")
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    setup_environment()
+    sys.path.insert(0, REPO_DIR)
+    s3 = LocalS3(copies=args.copies).start()
+    import pygame
+
+    results = {}
+    try:
+        # Keep every cache the game writes out of the checkout
+        with WorkDir():
+            if 'startup' in args.only:
+                from benchmarks.startup import bench_startup
+                results['startup'] = bench_startup(args.repeat)
+            if 'throughput' in args.only:
+                from benchmarks.startup import bench_throughput
+                results['throughput'] = bench_throughput(args.workers)
+            if 'adaptive' in args.only:
+                from benchmarks.startup import bench_adaptive
+                results['adaptive'] = bench_adaptive(args.latency_ms)
+            if 'decode' in args.only:
+                from benchmarks.decode import bench_decode
+                import main  # noqa: F401  Sets up the display for convert()
+                results['decode'] = bench_decode()
+            if 'frames' in args.only:
+                from benchmarks.frames import bench_frames
+                results['frames'] = bench_frames(args.frames)
+    finally:
+        s3.stop()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import time
+from benchmarks.harness import ASSET_DIR, WorkDir, summarize
+
+
+def sample(func, repeat):
+    """Time repeat calls of func, in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def bench_decode(repeat=20):
+    """Per-asset cost of each loading stage; a surface cache miss costs load plus scale"""
+    import pygame
+    from asset_specs import ASSET_SPECS, STREAMED_AUDIO
+    from audio import SoundCache
+    from surface_cache import SurfaceCache
+
+    results = {}
+    with WorkDir():
+        surface_cache = SurfaceCache()
+        sound_cache = SoundCache()
+        for name in sorted(os.listdir(ASSET_DIR)):
+            path = os.path.join(ASSET_DIR, name)
+            entry = {'bytes': os.path.getsize(path)}
+            with open(path, 'rb') as f:
+                source_hash = hashlib.sha256(f.read()).hexdigest()
+            if name.endswith(('.wav', '.mp3', '.ogg')):
+                entry['sound'] = sample(lambda: pygame.mixer.Sound(path), repeat)
+                # What a decoded Sound would hold in memory; streamed tracks never pay it
+                entry['pcm_bytes'] = len(pygame.mixer.Sound(path).get_raw())
+                if name in STREAMED_AUDIO:
+                    entry['music_load'] = sample(lambda: pygame.mixer.music.load(path), repeat)
+                else:
+                    sound_cache.get(source_hash, lambda: pygame.mixer.Sound(path))
+                    entry['sound_cache_hit'] = sample(lambda: sound_cache.load(source_hash), repeat)
+            elif name.endswith(('.png', '.jpg', '.JPG')):
+                entry['load'] = sample(lambda: pygame.image.load(path), repeat)
+                image = pygame.image.load(path)
+                entry['source_size'] = list(image.get_size())
+                entry['convert_alpha'] = sample(image.convert_alpha, repeat)
+                spec = ASSET_SPECS.get(name)
+                if spec is not None:
+                    size, opaque = spec['size'], spec['opaque']
+                    convert = 'convert' if opaque else 'convert_alpha'
+                    entry['scale'] = sample(
+                        lambda: getattr(pygame.transform.scale(image, size), convert)(), repeat)
+                    surface_cache.get(source_hash, size, opaque, lambda: pygame.image.load(path))
+                    entry['surface_cache_hit'] = sample(
+                        lambda: surface_cache.load(source_hash, size, opaque), repeat)
+            else:
+                continue
+            results[name] = entry
+    return results
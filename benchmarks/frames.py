@@ -0,0 +1,84 @@
+import time
+from benchmarks.harness import ASSET_DIR, WorkDir, summarize
+
+
+def fill_splashes(sim, frame, count=50):
+    """Keep about count splashes alive by bursting them every 60 frames"""
+    if frame % 60 == 0:
+        for i in range(count):
+            sim.particles.emit_splash(20 + i * 15, 290)
+
+
+def fill_adversaries(sim, frame, count=30):
+    """Keep count adversaries spread across the screen in level 2"""
+    from simulation import Adversary, WINDOW_WIDTH
+    sim.game_state.level = 2
+    sim.pools.clear()
+    while len(sim.adversaries) < count:
+        adversary = Adversary(sim.rng)
+        adversary.x = adversary.prev_x = sim.rng.uniform(0, WINDOW_WIDTH)
+        sim.adversaries.append(adversary)
+
+
+SCENARIOS = {
+    'level1': None,
+    'splashes_50': fill_splashes,
+    'adversaries_30': fill_adversaries,
+}
+
+
+def run_frames(scenario, renderer_mode, frames, steps_per_frame=2):
+    """Time the simulation, drawing and presenting phases of frames main-loop iterations"""
+    import pygame
+    import main
+    from renderer import create_renderer
+    from simulation import GameSimulation
+
+    # Constructing Games elsewhere may have replaced the display surface
+    main.screen = pygame.display.get_surface()
+    renderer = create_renderer(main.screen, renderer_mode)
+    sim = GameSimulation(seed=0)
+    setup = SCENARIOS[scenario]
+
+    phases = {'step': [], 'draw': [], 'present': [], 'frame': []}
+    for frame in range(frames):
+        start = time.perf_counter()
+        # Collisions still cost a respawn but never end the run; the HUD draws one
+        # heart per life, so top up a normal count rather than set a huge one
+        sim.game_state.lives = 3
+        if setup is not None:
+            setup(sim, frame)
+        for _ in range(steps_per_frame):
+            sim.step()
+        stepped = time.perf_counter()
+        main.draw_world(renderer, sim, 0.5)
+        drawn = time.perf_counter()
+        renderer.present()
+        end = time.perf_counter()
+        phases['step'].append((stepped - start) * 1000)
+        phases['draw'].append((drawn - stepped) * 1000)
+        phases['present'].append((end - drawn) * 1000)
+        phases['frame'].append((end - start) * 1000)
+
+    result = {phase: summarize(samples) for phase, samples in phases.items()}
+    result['particles'] = sim.particles.count
+    result['adversaries'] = len(sim.adversaries)
+    return result
+
+
+def bench_frames(frames=600, renderers=('full', 'dirty')):
+    """Frame time for each stress scenario and renderer"""
+    import main
+    from audio import SoundCache
+    from surface_cache import SurfaceCache
+    results = {}
+    with WorkDir():
+        # Both caches must point into this scratch directory, not a deleted earlier one
+        main.game.surface_cache = SurfaceCache()
+        main.game.sound_cache = SoundCache()
+        main.game.assets.clear()
+        main.game.load_local_assets(ASSET_DIR)
+        for scenario in SCENARIOS:
+            for mode in renderers:
+                results[f"{scenario}/{mode}"] = run_frames(scenario, mode, frames)
+    return results
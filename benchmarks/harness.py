@@ -0,0 +1,136 @@
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(REPO_DIR, 'assets')
+
+# Buckets in the local S3 stand-in: plain objects, objects plus a packed bundle,
+# and many copies of the assets for throughput runs
+OBJECTS_BUCKET = 'bench-assets'
+BUNDLE_BUCKET = 'bench-bundle'
+THROUGHPUT_BUCKET = 'bench-throughput'
+
+
+def setup_environment():
+    """Point pygame at dummy drivers and boto3 at fake credentials; call before importing either"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    # Never let a developer's .env or real credentials reach AWS from a benchmark
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+    os.environ['S3_BUCKET_NAME'] = OBJECTS_BUCKET
+    os.environ.pop('AWS_PROFILE', None)
+
+
+class LocalS3:
+    """An in-process S3 stand-in (moto) loaded with the files in assets/"""
+    def __init__(self, copies=8):
+        self.copies = copies
+        self.mock = None
+
+    def start(self):
+        try:
+            from moto import mock_aws
+        except ImportError:
+            raise SystemExit("The benchmarks need moto: pip install moto")
+        import boto3
+        from asset_bundle import build_bundle, BUNDLE_NAME
+
+        self.mock = mock_aws()
+        self.mock.start()
+        s3 = boto3.client('s3')
+        for bucket in (OBJECTS_BUCKET, BUNDLE_BUCKET, THROUGHPUT_BUCKET):
+            s3.create_bucket(Bucket=bucket)
+
+        self.asset_bytes = 0
+        for name in os.listdir(ASSET_DIR):
+            path = os.path.join(ASSET_DIR, name)
+            self.asset_bytes += os.path.getsize(path)
+            for bucket in (OBJECTS_BUCKET, BUNDLE_BUCKET):
+                s3.upload_file(path, bucket, name)
+            for copy in range(self.copies):
+                s3.upload_file(path, THROUGHPUT_BUCKET, f"copy{copy}/{name}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            bundle_path = os.path.join(tmp, BUNDLE_NAME)
+            build_bundle(ASSET_DIR, bundle_path)
+            s3.upload_file(bundle_path, BUNDLE_BUCKET, BUNDLE_NAME)
+        return self
+
+    def stop(self):
+        if self.mock is not None:
+            self.mock.stop()
+            self.mock = None
+
+
+def count_requests(manager):
+    """Count the S3 operations a manager's client makes, by operation name"""
+    counts = {}
+
+    def count(model, **kwargs):
+        counts[model.name] = counts.get(model.name, 0) + 1
+
+    manager.s3.meta.events.register('before-call.s3.*', count)
+    return counts
+
+
+def inject_latency(manager, latency_ms):
+    """Delay every S3 request a manager makes, as a high-latency link would"""
+    if latency_ms:
+        def delay(**kwargs):
+            time.sleep(latency_ms / 1000)
+
+        manager.s3.meta.events.register('before-send.s3.*', delay)
+
+
+def reset_s3_health():
+    """Forget the session's S3 health verdicts, as a fresh process would"""
+    import asset_manager_optimized
+    with asset_manager_optimized._health_lock:
+        asset_manager_optimized._health_states.clear()
+
+
+class WorkDir:
+    """A scratch working directory, so local_assets/ caches start empty"""
+    def __init__(self):
+        self.path = tempfile.mkdtemp(prefix='bench-')
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = os.getcwd()
+        os.chdir(self.path)
+        return self.path
+
+    def __exit__(self, *exc_info):
+        os.chdir(self.previous)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def timed(func, *args):
+    """Call func and return (result, elapsed ms)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summarize(samples_ms):
+    """Summary statistics (in ms) for a list of timings"""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'p50_ms': round(percentile(50), 4),
+        'p95_ms': round(percentile(95), 4),
+        'p99_ms': round(percentile(99), 4),
+        'max_ms': round(ordered[-1], 4),
+    }
@@ -0,0 +1,109 @@
+import asyncio
+import os
+from benchmarks.harness import (OBJECTS_BUCKET, BUNDLE_BUCKET, THROUGHPUT_BUCKET, WorkDir,
+                                count_requests, inject_latency, reset_s3_health, summarize, timed)
+
+
+def run_startup(bucket):
+    """Construct a Game and load level 1 the way main() does"""
+    import main
+    reset_s3_health()
+    os.environ['S3_BUCKET_NAME'] = bucket
+    game, construct_ms = timed(main.Game)
+    requests = count_requests(game.asset_manager)
+    _, load_ms = timed(asyncio.run, game.load_assets(level=1))
+    return {
+        'construct_ms': round(construct_ms, 3),
+        'load_assets_ms': round(load_ms, 3),
+        'assets_loaded': len(game.assets),
+        'requests': requests,
+    }
+
+
+def run_asset_cache(bucket, sync):
+    """Time GameAssetManager.create_asset_cache against the current working directory"""
+    from asset_manager_optimized import GameAssetManager
+    reset_s3_health()
+    os.environ['S3_BUCKET_NAME'] = bucket
+    manager = GameAssetManager()
+    requests = count_requests(manager)
+    ok, elapsed = timed(manager.create_asset_cache, 'local_assets', sync)
+    return {'ok': ok, 'elapsed_ms': round(elapsed, 3), 'requests': requests}
+
+
+def bench_startup(repeat=5):
+    """Cold (empty cache) and warm (populated cache) startup, with and without the bundle"""
+    results = {}
+    for name, bucket in (('objects', OBJECTS_BUCKET), ('bundle', BUNDLE_BUCKET)):
+        with WorkDir():
+            cold = run_startup(bucket)
+            warm = [run_startup(bucket) for _ in range(repeat)]
+        results[name] = {
+            'cold': cold,
+            'warm': {
+                'load_assets': summarize([run['load_assets_ms'] for run in warm]),
+                'construct': summarize([run['construct_ms'] for run in warm]),
+                'requests': warm[-1]['requests'],
+            },
+        }
+
+    for sync in (True, False):
+        with WorkDir():
+            cold = run_asset_cache(OBJECTS_BUCKET, sync)
+            warm = [run_asset_cache(OBJECTS_BUCKET, sync) for _ in range(repeat)]
+        results['create_asset_cache' if sync else 'create_asset_cache_nosync'] = {
+            'cold': cold,
+            'warm': summarize([run['elapsed_ms'] for run in warm]),
+            'warm_requests': warm[-1]['requests'],
+        }
+    return results
+
+
+def bench_throughput(worker_counts=(1, 2, 4, 8, 16), repeat=3):
+    """Cold sync throughput of the replicated asset set versus max_workers"""
+    from asset_manager_optimized import GameAssetManager
+    results = []
+    for workers in worker_counts:
+        samples = []
+        for _ in range(repeat):
+            with WorkDir():
+                reset_s3_health()
+                os.environ['S3_BUCKET_NAME'] = THROUGHPUT_BUCKET
+                manager = GameAssetManager(max_workers=workers, adaptive=False)
+                synced, elapsed = timed(manager.sync_assets)
+                size = sum(os.path.getsize(path) for path in synced.values() if path)
+            samples.append(elapsed)
+        best = min(samples)
+        results.append({
+            'max_workers': workers,
+            'objects': len(synced),
+            'bytes': size,
+            'elapsed': summarize(samples),
+            'mb_per_s': round(size / 1e6 / (best / 1000), 3),
+        })
+    return results
+
+
+def bench_adaptive(latencies_ms=(0, 50, 200), repeat=3):
+    """Cold sync time with fixed versus adaptive download concurrency under injected latency"""
+    from asset_manager_optimized import GameAssetManager
+    results = {}
+    for latency in latencies_ms:
+        for mode, adaptive in (('fixed', False), ('adaptive', True)):
+            samples = []
+            limits = []
+            for _ in range(repeat):
+                with WorkDir():
+                    reset_s3_health()
+                    os.environ['S3_BUCKET_NAME'] = THROUGHPUT_BUCKET
+                    manager = GameAssetManager(max_workers=4, adaptive=adaptive)
+                    inject_latency(manager, latency)
+                    synced, elapsed = timed(manager.sync_assets)
+                samples.append(elapsed)
+                limits.append(manager.limiter.limit)
+            results[f"{latency}ms/{mode}"] = {
+                'objects': len(synced),
+                'elapsed': summarize(samples),
+                'final_limit': limits,
+            }
+    return results
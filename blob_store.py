@@ -0,0 +1,148 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# Temp files older than this are leftovers from a crashed download
+STALE_TEMP_SECONDS = 3600
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Get the SHA-256 hex digest and size of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """Content-addressed cache files named by their SHA-256, evicted least recently used
+
+    Blobs are written to a temp file and renamed into place, so a crash never
+    leaves a partial blob under a real name. Reads check size and hash, and
+    touch the file so its mtime records when it was last used. Files in
+    shared_dirs (caches derived from blobs, such as decoded surfaces) count
+    against the same budget and are evicted in the same LRU order.
+    """
+    def __init__(self, root, max_bytes=256 * 1024 * 1024, shared_dirs=()):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.shared_dirs = list(shared_dirs)
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        # Blobs read or written this session are never evicted from under the game
+        self.in_use = set()
+        # digest -> (size, mtime_ns) of blobs already hashed this session
+        self.verified = {}
+        self.remove_stale_temp()
+        # Derived caches grow without downloads, so enforce the budget at startup too
+        self.evict()
+
+    def path(self, digest):
+        """Get the file path of a blob"""
+        return os.path.join(self.root, digest)
+
+    def temp_path(self):
+        """Reserve a temp file to download into before commit()"""
+        fd, path = tempfile.mkstemp(dir=self.tmp_dir, suffix='.part')
+        os.close(fd)
+        return path
+
+    def commit(self, tmp_path):
+        """Move a finished temp file into the store and return its digest"""
+        digest, size = hash_file(tmp_path)
+        path = self.path(digest)
+        os.replace(tmp_path, path)
+        self.mark_used(digest, path)
+        self.evict()
+        return digest
+
+    def get(self, digest, size=None):
+        """Get the path of an intact blob, or None if it is missing or corrupt"""
+        if not digest:
+            return None
+        path = self.path(digest)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if size is not None and stat.st_size != size:
+            self.discard(digest)
+            return None
+
+        with self.lock:
+            verified = self.verified.get(digest) == (stat.st_size, stat.st_mtime_ns)
+        if not verified:
+            try:
+                actual, _ = hash_file(path)
+            except OSError:
+                return None
+            if actual != digest:
+                self.discard(digest)
+                return None
+        self.mark_used(digest, path)
+        return path
+
+    def mark_used(self, digest, path):
+        """Record a use for LRU ordering and remember that the blob is intact"""
+        with contextlib.suppress(OSError):
+            os.utime(path)
+            stat = os.stat(path)
+            with self.lock:
+                self.in_use.add(digest)
+                self.verified[digest] = (stat.st_size, stat.st_mtime_ns)
+
+    def discard(self, digest):
+        """Remove a blob that failed verification"""
+        with self.lock:
+            self.verified.pop(digest, None)
+            self.in_use.discard(digest)
+        with contextlib.suppress(OSError):
+            os.remove(self.path(digest))
+
+    def evict(self):
+        """Remove least recently used files until the store fits its byte budget"""
+        with self.lock:
+            files = []  # (mtime_ns, size, path, digest or None for a derived file)
+            total = 0
+            for directory in [self.root] + self.shared_dirs:
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    # Skip temp files that a cache is still writing
+                    if not entry.is_file() or entry.name.endswith('.tmp'):
+                        continue
+                    with contextlib.suppress(OSError):
+                        stat = entry.stat()
+                        total += stat.st_size
+                        digest = entry.name if directory == self.root else None
+                        files.append((stat.st_mtime_ns, stat.st_size, entry.path, digest))
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path, digest in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if digest in self.in_use:
+                    continue
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                    total -= size
+                    self.verified.pop(digest, None)
+
+    def remove_stale_temp(self):
+        """Delete temp files abandoned by interrupted downloads"""
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        with os.scandir(self.tmp_dir) as entries:
+            for entry in entries:
+                with contextlib.suppress(OSError):
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
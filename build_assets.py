@@ -0,0 +1,109 @@
+# Offline asset build: python build_assets.py [--src assets] [--out build/assets] [--atlas] [--bundle]
+# Images are scaled exactly as the game would scale them at load time, sprites
+# saved as PNG and the opaque backgrounds as JPEG; sounds are re-encoded to OGG
+# Vorbis when ffmpeg is installed and copied unchanged otherwise.
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from asset_specs import ASSET_SPECS, BUILD_FORMATS, build_name
+
+
+def build_image(src_path, out_path, spec):
+    """Scale an image to its draw size and save it in the format its extension names"""
+    import pygame
+    image = pygame.image.load(src_path)
+    if image.get_size() != tuple(spec['size']):
+        image = pygame.transform.scale(image, spec['size'])
+    elif os.path.splitext(src_path)[1].lower() == os.path.splitext(out_path)[1].lower():
+        # Already the right size and format; re-encoding could only lose quality
+        shutil.copyfile(src_path, out_path)
+        return
+    # pygame picks the encoder from the extension, so keep it on the temp name
+    stem, ext = os.path.splitext(out_path)
+    tmp_path = f"{stem}.tmp{ext}"
+    pygame.image.save(image, tmp_path)
+    os.replace(tmp_path, out_path)
+
+
+def build_sound(src_path, out_path, quality=3):
+    """Re-encode a sound to OGG Vorbis; returns False if no encoder is available"""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        return False
+    tmp_path = out_path[:-len('.ogg')] + '.tmp.ogg'
+    subprocess.run([ffmpeg, '-loglevel', 'error', '-y', '-i', src_path,
+                    '-map_metadata', '-1', '-vn', '-c:a', 'libvorbis', '-q:a', str(quality), tmp_path],
+                   check=True)
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def build_assets(src_dir, out_dir):
+    """Write the optimized copy of every asset in src_dir; returns {output name: bytes}"""
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {}
+    for asset_file in sorted(os.listdir(src_dir)):
+        src_path = os.path.join(src_dir, asset_file)
+        if not os.path.isfile(src_path):
+            continue
+        output_format = BUILD_FORMATS.get(asset_file)
+        out_name = build_name(asset_file)
+
+        if output_format in ('png', 'jpg'):
+            build_image(src_path, os.path.join(out_dir, out_name), ASSET_SPECS[asset_file])
+        elif output_format == 'ogg':
+            try:
+                encoded = build_sound(src_path, os.path.join(out_dir, out_name))
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Failed to encode {asset_file}: {e}")
+                encoded = False
+            if not encoded:
+                print(f"Keeping {asset_file} as is; install ffmpeg to encode OGG")
+                out_name = asset_file
+                shutil.copyfile(src_path, os.path.join(out_dir, out_name))
+        else:
+            shutil.copyfile(src_path, os.path.join(out_dir, out_name))
+
+        size = os.path.getsize(os.path.join(out_dir, out_name))
+        print(f"{asset_file:<24} {os.path.getsize(src_path):>9} -> {out_name:<24} {size:>9}")
+        outputs[out_name] = size
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-optimize assets to their draw sizes and runtime formats")
+    parser.add_argument('--src', default='assets')
+    parser.add_argument('--out', default=os.path.join('build', 'assets'))
+    parser.add_argument('--budget-kb', type=int, default=1024, help="fail if the output is larger")
+    parser.add_argument('--atlas', action='store_true', help="also pack the sprites into an atlas")
+    parser.add_argument('--bundle', action='store_true', help="also pack the output into a bundle")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.src) == os.path.abspath(args.out):
+        sys.exit("--out must differ from --src")
+    outputs = build_assets(args.src, args.out)
+    if args.atlas:
+        from sprite_atlas import build_atlas
+        from asset_specs import ATLAS_NAME, ATLAS_INDEX_NAME
+        build_atlas(args.src, args.out)
+        for name in (ATLAS_NAME, ATLAS_INDEX_NAME):
+            outputs[name] = os.path.getsize(os.path.join(args.out, name))
+
+    total = sum(outputs.values())
+    budget = args.budget_kb * 1024
+    print(f"{len(outputs)} files, {total} bytes (budget {budget})")
+
+    if args.bundle:
+        from asset_bundle import build_bundle, BUNDLE_NAME
+        bundle_path = os.path.join(os.path.dirname(os.path.abspath(args.out)), BUNDLE_NAME)
+        build_bundle(args.out, bundle_path)
+        print(f"Packed {bundle_path} ({os.path.getsize(bundle_path)} bytes)")
+
+    if total > budget:
+        sys.exit(f"Assets exceed the {args.budget_kb} KB budget by {total - budget} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import concurrent.futures
+import io
+import multiprocessing
+import os
+
+
+def init_worker():
+    """Keep worker processes away from the display and audio devices"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+
+def decode_image(path, offset, length, namehint, size, opaque):
+    """Decode and optionally resize an image in a worker, returning (pixels, size, format)"""
+    import pygame
+    from surface_cache import _to_bytes
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read() if length is None else f.read(length)
+    image = pygame.image.load(io.BytesIO(data), namehint)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    pixel_format = 'RGB' if opaque else 'RGBA'
+    return _to_bytes(image, pixel_format), image.get_size(), pixel_format
+
+
+class DecodePool:
+    """Decodes images on worker processes; converting for the display stays with the caller"""
+    def __init__(self, workers):
+        # Workers are forked so they never re-run main.py's module-level setup
+        context = multiprocessing.get_context('fork')
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=init_worker)
+        # The executor forks every worker on its first submit. Do that now, so the
+        # caller controls when: create the pool before any other thread starts
+        self.executor.submit(os.getpid).result()
+
+    @staticmethod
+    def is_supported():
+        """Check if this platform can fork decode workers"""
+        return hasattr(os, 'fork') and 'fork' in multiprocessing.get_all_start_methods()
+
+    def submit(self, path, namehint, size=None, opaque=False, offset=0, length=None):
+        """Start decoding an image file, or a slice of one such as a bundle entry"""
+        return self.executor.submit(decode_image, path, offset, length, namehint, size, opaque)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+import pygame
+
+YELLOW = (255, 255, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+
+class HUD:
+    """Heads-up display with fonts created once and rendered text cached by value"""
+    def __init__(self, window_width, window_height, max_cached=128):
+        self.window_width = window_width
+        self.window_height = window_height
+        self.max_cached = max_cached
+        self.fonts = {}
+        # (text, size, color) -> rendered Surface, least recently used first
+        self.text_cache = OrderedDict()
+
+    def get_font(self, size):
+        """Get the default font at a size, creating it only once"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, size, color=WHITE):
+        """Render text, reusing the cached surface while the value is unchanged"""
+        key = (text, size, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.get_font(size).render(text, True, color)
+            self.text_cache[key] = surface
+            if len(self.text_cache) > self.max_cached:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
+    def draw_text(self, screen, text, size, color=WHITE, pos=None, center=None):
+        """Blit cached text at a top-left position or centered on a point"""
+        surface = self.render(text, size, color)
+        if center is not None:
+            pos = surface.get_rect(center=center)
+        return screen.blit(surface, pos)
+
+    def draw_level(self, screen, level):
+        """Draw the level label in the top-right corner"""
+        return self.draw_text(screen, f"Level: {level}", 36, WHITE, (self.window_width - 120, 10))
+
+    def draw_score(self, screen, score):
+        """Draw the score counter under the level label"""
+        return self.draw_text(screen, f"Score: {score}", 36, WHITE, (self.window_width - 120, 40))
+
+    def draw_cheat_indicator(self, screen, cheat_activated):
+        """Draw the cheat mode marker in the bottom-left corner"""
+        if cheat_activated:
+            return self.draw_text(screen, "CHEAT MODE", 24, YELLOW, (10, self.window_height - 30))
+        return None
+
+    def draw_lives(self, screen, lives, heart_img=None):
+        """Draw one heart per remaining life"""
+        rects = []
+        for i in range(lives):
+            if heart_img:
+                rects.append(screen.blit(heart_img, (10 + i * 35, 10)))
+            else:
+                rects.append(pygame.draw.circle(screen, RED, (25 + i * 35, 25), 10))
+        return rects
@@ -1,71 +1,420 @@
+import time
+# Time-to-first-frame is measured from here, before the heavy imports
+STARTED = time.perf_counter()
+import asyncio
 import pygame
-import random
 import math
 import os
-import time
+import hashlib
+import queue
+import sys
+import threading
 from asset_manager_optimized import GameAssetManager
+from asset_bundle import AssetBundle, BUNDLE_NAME
+from asset_specs import (ASSET_SPECS, ASSET_LEVELS, STREAMED_AUDIO, ATLAS_NAME, ATLAS_INDEX_NAME,
+                         asset_level, atlas_covered, build_name, runtime_name)
+from sprite_atlas import load_index, unpack_atlas
+from audio import SoundCache, MusicTrack
+from surface_cache import SurfaceCache
+from decode_pool import DecodePool
+from hud import HUD
+from profiler import FrameProfiler
+from telemetry import Telemetry
+from renderer import create_renderer
+from scenes import Scene, SceneManager
+from simulation import (GameSimulation, WINDOW_WIDTH, WINDOW_HEIGHT, FLOOR_HEIGHT,
+                        player_width, player_height, pool_width, pool_height,
+                        STEP_MS)
 from dotenv import load_dotenv, dotenv_values 
 # loading variables from .env file
 load_dotenv()
 class Game:
-    def __init__(self):
+    def __init__(self, decode_pool=None):
+        # Decoding images on worker processes is optional; see GAME_DECODE_WORKERS
+        self.decode_pool = decode_pool
         pygame.init()
         self.screen = pygame.display.set_mode((800, 400))
-        self.asset_manager = GameAssetManager()
+        # GAME_TELEMETRY_EXPORT=assets.prom,assets.jsonl writes the asset pipeline metrics on exit
+        self.telemetry = Telemetry()
+        self.telemetry_paths = [path for path in os.getenv('GAME_TELEMETRY_EXPORT', '').split(',') if path]
+        self.asset_manager = GameAssetManager(telemetry=self.telemetry)
         self.assets = {}
+        self.bundle = None
+        self.asset_source = None  # Where level 1 came from, for the startup log
+        self.revalidate = False  # Loaded from cache; check S3 once the game is running
+        self.surface_cache = SurfaceCache()
+        self.sound_cache = SoundCache()
+        self.pending_decodes = []  # (runtime name, source_hash, future)
+        self.atlas_index = None
+        self.atlas_sprites = set()  # Sprites cut from the atlas instead of loaded on their own
+        self.prefetched = queue.Queue()
+        self.prefetch_thread = None
+        self.hud = HUD(WINDOW_WIDTH, WINDOW_HEIGHT)
+        # F3 toggles the overlay; GAME_PROFILE_EXPORT=frames.csv (or .json) records every frame
+        self.profiler = FrameProfiler(export_path=os.getenv('GAME_PROFILE_EXPORT'))
         
-    def show_loading_screen(self):
+    def show_loading_screen(self, loaded=0):
         """Display loading screen while assets download"""
         self.screen.fill((0, 0, 0))
-        font = pygame.font.Font(None, 36)
-        loading_text = font.render("Loading Game Assets...", True, (255, 255, 255))
-        text_rect = loading_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-        self.screen.blit(loading_text, text_rect)
+        message = f"Loading Game Assets... ({loaded})" if loaded else "Loading Game Assets..."
+        self.hud.draw_text(self.screen, message, 36, (255, 255, 255),
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
         pygame.display.flip()
 
 
-    def load_assets(self):
-        """Load all game assets"""
+    def load_asset_file(self, asset_file, source, source_hash=None, location=None):
+        """Decode a single asset from a path or file object into a pygame object"""
+        # location is (path, offset, length) for sources that are slices of a larger file
+        name = runtime_name(asset_file)
+        if name in self.atlas_sprites:
+            return
+        # Only decodes on this thread are timed; cache hits are not decodes, and images
+        # sent to the decode pool are timed when collected
+        decode_timer = self.telemetry.timer('asset_decode_seconds', asset=name, stage='main')
+        try:
+            if asset_file == ATLAS_INDEX_NAME:
+                with decode_timer:
+                    self.atlas_index = load_index(source)
+            elif name in ASSET_SPECS:
+                # Sprites and backgrounds come pre-scaled and pre-converted from the surface cache
+                spec = ASSET_SPECS[name]
+                if source_hash is None:
+                    with open(source, 'rb') as f:
+                        source_hash = hashlib.sha256(f.read()).hexdigest()
+                surface = self.surface_cache.load(source_hash, spec['size'], spec['opaque'])
+                if surface is not None:
+                    self.assets[name] = surface
+                elif self.decode_pool is not None:
+                    self.submit_decode(asset_file, source, location, source_hash, spec)
+                else:
+                    with decode_timer:
+                        self.assets[name] = self.surface_cache.get(
+                            source_hash, spec['size'], spec['opaque'],
+                            lambda: pygame.image.load(source, asset_file))
+            elif asset_file.endswith(('.png', '.jpg', '.JPG')):
+                if self.decode_pool is not None:
+                    self.submit_decode(asset_file, source, location)
+                else:
+                    with decode_timer:
+                        self.assets[name] = pygame.image.load(source, asset_file).convert_alpha()
+            elif name in STREAMED_AUDIO:
+                # Long tracks stream from disk when played instead of decoding to PCM now
+                self.assets[name] = MusicTrack(asset_file, path=source)
+            elif asset_file.endswith(('.wav', '.mp3', '.ogg')):
+                # Short effects are decoded once and their PCM reused on later launches
+                if source_hash is None:
+                    with open(source, 'rb') as f:
+                        source_hash = hashlib.sha256(f.read()).hexdigest()
+                sound = self.sound_cache.load(source_hash)
+                if sound is None:
+                    with decode_timer:
+                        sound = self.sound_cache.get(source_hash, lambda: pygame.mixer.Sound(source))
+                self.assets[name] = sound
+        except pygame.error as e:
+            print(f"Failed to load asset {asset_file}: {e}")
+        except ValueError as e:
+            print(f"Failed to load atlas index {asset_file}: {e}")
+        self.unpack_atlas()
+
+    def unpack_atlas(self):
+        """Cut the sprites out of the atlas once both its image and index are loaded"""
+        atlas = self.assets.get(ATLAS_NAME)
+        if atlas is None or self.atlas_index is None or self.atlas_sprites:
+            return
+        try:
+            sprites = unpack_atlas(atlas, self.atlas_index)
+        except (KeyError, ValueError) as e:
+            print(f"Atlas index does not match {ATLAS_NAME}: {e}")
+            return
+        # Sprites blit from subsurfaces of the one atlas texture
+        self.assets.update(sprites)
+        self.atlas_sprites = set(sprites)
+
+    def submit_decode(self, asset_file, source, location=None, source_hash=None, spec=None):
+        """Hand an image to the decode workers; collect_decodes() picks up the result"""
+        path, offset, length = location or (source, 0, None)
+        size, opaque = (spec['size'], spec['opaque']) if spec is not None else (None, False)
+        future = self.decode_pool.submit(path, asset_file, size, opaque, offset, length)
+        self.pending_decodes.append((runtime_name(asset_file), source_hash, future))
+
+    def collect_decodes(self, wait=False):
+        """Turn finished worker decodes into display surfaces on the main thread"""
+        pending = []
+        for name, source_hash, future in self.pending_decodes:
+            if not wait and not future.done():
+                pending.append((name, source_hash, future))
+                continue
+            if name in self.atlas_sprites:
+                # The atlas was unpacked while this separate copy was decoding
+                continue
+            try:
+                pixels, size, pixel_format = future.result()
+            except Exception as e:
+                print(f"Failed to load asset {name}: {e}")
+                continue
+            with self.telemetry.timer('asset_decode_seconds', asset=name, stage='convert'):
+                opaque = pixel_format == 'RGB'
+                surface = pygame.image.frombuffer(pixels, size, pixel_format)
+                self.assets[name] = surface.convert() if opaque else surface.convert_alpha()
+                if source_hash is not None:
+                    self.surface_cache.store_pixels(source_hash, size, opaque, pixels)
+        self.pending_decodes = pending
+        self.unpack_atlas()
+
+    async def load_assets(self, level=1):
+        """Load the assets needed up to the given level without blocking the event loop"""
+        started = time.perf_counter()
+        await self.load_level_assets(level)
+        self.telemetry.observe('game_load_assets_seconds', time.perf_counter() - started,
+                               level=level, source=self.asset_source)
+        self.telemetry.count('game_assets_loaded_total', len(self.assets), source=self.asset_source)
+
+    async def load_level_assets(self, level):
+        """Load from the cache, the bundle, S3 or the local directory, whichever works first"""
         cache_dir = 'local_assets'
         
         # Show loading screen
         self.show_loading_screen()
         
-        # Try to load from S3
-        if self.asset_manager.create_asset_cache(cache_dir):
-            # Load cached assets into pygame
-            for asset_file in os.listdir(cache_dir):
-                file_path = os.path.join(cache_dir, asset_file)
-                try:
-                    if asset_file.endswith(('.png', '.jpg', '.JPG')):
-                        self.assets[asset_file] = pygame.image.load(file_path).convert_alpha()
-                    elif asset_file.endswith(('.wav', '.mp3')):
-                        self.assets[asset_file] = pygame.mixer.Sound(file_path)
-                except pygame.error as e:
-                    print(f"Failed to load asset {asset_file}: {e}")
+        self.asset_manager.cache_dir = cache_dir
+        self.asset_manager.ensure_cache_dir()
+        wanted = lambda asset_file: asset_level(asset_file) <= level
+
+        # The browser build cannot start threads, which S3 downloads run on, so it
+        # plays from the bundle or asset directory packed with the game
+        if BROWSER:
+            if os.path.exists(BUNDLE_NAME) and self.load_bundle(BUNDLE_NAME, wanted):
+                self.asset_source = 'bundle'
+            else:
+                self.asset_source = 'local'
+                self.load_local_assets(wanted=wanted)
+            return
+
+        # Fast start: a complete, verified cache from the last sync is trusted as is,
+        # with no boto3 import or round trip before the first frame
+        if FAST_START:
+            cached = self.asset_manager.get_cached_assets(wanted)
+            if cached is not None and self.load_cached(cached, wanted):
+                # The manifest only lists what the last sync fetched, so check the
+                # level is actually complete before skipping S3 and the local copies
+                missing = self.missing_assets(level)
+                if not missing:
+                    self.asset_source = 'cache'
+                    self.revalidate = True
+                    return
+                print(f"Cache is missing {', '.join(missing)}; checking S3")
+
+        # Prefer the packed bundle: one GET and one mapped file for every asset
+        bundle_path = await self.asset_manager.download_bundle_async(BUNDLE_NAME)
+        if self.load_bundle(bundle_path, wanted):
+            self.asset_source = 'bundle'
+            return
+        self.asset_source = 's3'
+
+        # Otherwise load from S3, decoding each asset as soon as its download lands
+        failed = False
+        if await self.asset_manager.is_available_async():
+            async for asset_file, file_path in self.asset_manager.stream_assets_async(
+                    wanted=wanted, skip=atlas_covered):
+                pygame.event.pump()
+                if file_path is None:
+                    failed = True
+                    continue
+                self.load_asset_file(asset_file, file_path)
+                self.collect_decodes()
+                self.show_loading_screen(len(self.assets))
+            self.collect_decodes(wait=True)
         else:
-            print("Failed to load assets from S3, falling back to local assets")
-            self.load_local_assets()
-
-
-
+            failed = True
 
+        if failed or not self.assets:
+            print("Failed to load assets from S3, falling back to local assets")
+            self.asset_source = 'local'
+            self.load_local_assets(wanted=wanted)
+
+    def missing_assets(self, level):
+        """Get the assets up to a level that are not loaded under any of their names"""
+        # Atlas sprites count once cut from the atlas; the atlas files themselves are optional
+        return [asset_file for asset_file, first_level in ASSET_LEVELS.items()
+                if first_level <= level and asset_file not in (ATLAS_NAME, ATLAS_INDEX_NAME)
+                and asset_file not in self.assets]
+
+    def load_cached(self, cached, wanted=None):
+        """Load assets from verified cache paths, preferring a cached bundle"""
+        if BUNDLE_NAME in cached:
+            return self.load_bundle(cached[BUNDLE_NAME], wanted)
+        # An earlier sync may have cached the separate sprites as well as the atlas
+        skipped = atlas_covered(cached)
+        for asset_file, file_path in cached.items():
+            if asset_file not in skipped:
+                self.load_asset_file(asset_file, file_path)
+        self.collect_decodes(wait=True)
+        return bool(self.assets)
+
+    def load_bundle(self, bundle_path, wanted=None):
+        """Load the wanted assets from a packed bundle"""
+        if bundle_path is None:
+            return False
+        # The bundle fast start already mapped is reused rather than mapped again
+        if self.bundle is None or self.bundle.path != bundle_path:
+            try:
+                bundle = AssetBundle(bundle_path)
+            except (OSError, ValueError) as e:
+                print(f"Failed to open asset bundle {bundle_path}: {e}")
+                return False
+            self.close_bundle()
+            self.bundle = bundle
+
+        # With an atlas in the bundle its sprites never need decoding on their own
+        skipped = atlas_covered(self.bundle.names())
+        for asset_file in self.bundle.names():
+            if asset_file not in skipped and (wanted is None or wanted(asset_file)):
+                self.load_bundle_asset(asset_file)
+        self.collect_decodes(wait=True)
+        return True
+
+    def close_bundle(self):
+        """Unmap the current bundle, dropping the tracks that stream from it"""
+        if self.bundle is None:
+            return
+        for name, asset in list(self.assets.items()):
+            if isinstance(asset, MusicTrack) and asset.bundle is self.bundle:
+                asset.close()
+                del self.assets[name]
+        self.bundle.close()
+        self.bundle = None
+
+    def load_bundle_asset(self, asset_file):
+        """Decode a single asset straight from the mapped bundle"""
+        if runtime_name(asset_file) in STREAMED_AUDIO:
+            self.assets[runtime_name(asset_file)] = MusicTrack(asset_file, bundle=self.bundle)
+            return
+        offset, length, source_hash = self.bundle.index[asset_file]
+        location = (self.bundle.path, self.bundle.data_start + offset, length)
+        with self.bundle.open(asset_file) as source:
+            self.load_asset_file(asset_file, source, source_hash, location)
+
+    def load_local_assets(self, asset_dir='assets', wanted=None):
+        """Load any assets still missing from the bundled asset directory"""
+        if not os.path.isdir(asset_dir):
+            return
+        asset_files = os.listdir(asset_dir)
+        skipped = atlas_covered(asset_files)
+        for asset_file in asset_files:
+            if asset_file in skipped:
+                continue
+            if runtime_name(asset_file) not in self.assets and (wanted is None or wanted(asset_file)):
+                self.load_asset_file(asset_file, os.path.join(asset_dir, asset_file))
+        self.collect_decodes(wait=True)
+
+    def export_telemetry(self):
+        """Write the asset pipeline metrics to every GAME_TELEMETRY_EXPORT path"""
+        for path in self.telemetry_paths:
+            try:
+                self.telemetry.export(path)
+            except OSError as e:
+                print(f"Failed to write telemetry to {path}: {e}")
+
+    def prefetch_assets(self):
+        """Fetch the assets for later levels on a worker thread"""
+        if self.bundle is not None:
+            # Everything is already on disk; just queue the rest for decoding
+            for asset_file in self.bundle.names():
+                if runtime_name(asset_file) not in self.assets:
+                    self.prefetched.put((asset_file, None))
+            if not self.revalidate:
+                return
+            # A bundle trusted from the cache is refreshed for the next launch
+            worker = lambda: self.asset_manager.download_bundle(BUNDLE_NAME)
+        elif BROWSER:
+            # No worker thread in the browser; later levels come from the packed directory
+            asset_files = os.listdir('assets') if os.path.isdir('assets') else []
+            skipped = atlas_covered(asset_files)
+            for asset_file in asset_files:
+                if asset_file not in skipped and runtime_name(asset_file) not in self.assets:
+                    self.prefetched.put((asset_file, os.path.join('assets', asset_file)))
+            return
+        else:
+            def worker():
+                if not self.asset_manager.is_available():
+                    return
+                # Syncing every key also revalidates the assets already loaded from
+                # the cache; changed ones are picked up on the next launch
+                for asset_file, file_path in self.asset_manager.stream_assets(skip=atlas_covered):
+                    if file_path is not None and runtime_name(asset_file) not in self.assets:
+                        self.prefetched.put((asset_file, file_path))
+
+        self.prefetch_thread = threading.Thread(target=worker, daemon=True)
+        self.prefetch_thread.start()
+
+    def load_prefetched(self, limit=1):
+        """Decode prefetched assets on the main thread, a few per frame; returns how many"""
+        # Decoding needs the display, so the worker only downloads
+        self.collect_decodes()
+        loaded = 0
+        while limit is None or loaded < limit:
+            try:
+                asset_file, file_path = self.prefetched.get_nowait()
+            except queue.Empty:
+                break
+            if runtime_name(asset_file) in self.assets:
+                continue
+            if file_path is None:
+                self.load_bundle_asset(asset_file)
+            else:
+                self.load_asset_file(asset_file, file_path)
+            loaded += 1
+        return loaded
+
+    def ensure_level(self, level):
+        """Make sure a level's assets are loaded without waiting on the network"""
+        self.load_prefetched(limit=None)
+        self.collect_decodes(wait=True)
+        for asset_file, first_level in ASSET_LEVELS.items():
+            if first_level > level or asset_file in self.assets:
+                continue
+            # Still downloading: use whatever local copy exists, or draw the fallback shape
+            candidates = [(name, self.asset_manager.get_cached_path(name))
+                          for name in (build_name(asset_file), asset_file)]
+            candidates.append((asset_file, os.path.join('assets', asset_file)))
+            for name, file_path in candidates:
+                if file_path is not None and os.path.exists(file_path):
+                    self.load_asset_file(name, file_path)
+                    break
+        self.collect_decodes(wait=True)
+
+
+# GAME_DECODE_WORKERS=N decodes and scales images on N worker processes. They are
+# forked here, before pygame.init() starts SDL's threads: a child forked from a
+# process with live threads can deadlock on a lock one of them held
+DECODE_WORKERS = int(os.getenv('GAME_DECODE_WORKERS', '0'))
+decode_pool = None
+if DECODE_WORKERS > 0 and DecodePool.is_supported():
+    decode_pool = DecodePool(DECODE_WORKERS)
 
 # Initialize Pygame
 pygame.init()
 pygame.mixer.init()
 
-# Set up display
-WINDOW_WIDTH = 800
-WINDOW_HEIGHT = 400
-FLOOR_HEIGHT = 300
+# Set up display (world geometry and physics constants live in simulation.py)
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption("Water Jump Platformer")
 
-# Water pool properties
-pool_width = 80
-pool_height = 20
-pools = []
+# Fast start: trust a complete local cache and revalidate it in the background
+# (GAME_FAST_START=0 checks S3 before the first frame instead)
+FAST_START = os.getenv('GAME_FAST_START', '1') != '0'
+
+# The pygbag build runs CPython compiled to WebAssembly, which has no threads
+BROWSER = sys.platform == 'emscripten'
+
+# Renderer: 'full' redraws and flips every frame, 'dirty' only updates changed regions
+RENDERER = os.getenv('GAME_RENDERER', 'full')
+
+# The simulation runs in fixed steps of STEP_MS; rendering interpolates between them
+MAX_FRAME_MS = 250  # Longer stalls are dropped instead of simulated
+MAX_FPS = int(os.getenv('GAME_MAX_FPS', '144'))
+TRANSITION_MS = 2000  # How long the level banner stays up
+GAME_OVER_GRACE_MS = 500  # Keys pressed this soon after the end screen appears are ignored
 
 # Colors
 WHITE = (255, 255, 255)
@@ -77,58 +426,15 @@ BROWN = (139, 69, 19)
 RED = (255, 0, 0)
 
 # Initialize game
-def test_s3_connection():
-    asset_manager = GameAssetManager()
-    if asset_manager.is_available():
-        assets = asset_manager.list_assets()
-        print("Found assets:", assets)
-    else:
-        print("S3 connection failed")
-
-# Add this to your main game initialization
-test_s3_connection()
-game = Game()
-    
-    # Upload assets to S3 (only need to do this once)
-    # game.upload_initial_assets('original_assets')
+game = Game(decode_pool)
     
-    # Load assets from S3 cache
-game.load_assets()
+    # Publish assets to S3 with: python asset_manager_optimized.py upload [asset_dir]
 
-# Load assets
-try:
-    # Player and backgrounds
-    player_img = game.assets['hero.png']
-    player_img = pygame.transform.scale(player_img, (40, 60))
-    
-    background_img_1 = game.assets['day_background1.jpg']
-    background_img_1 = pygame.transform.scale(background_img_1, (WINDOW_WIDTH, WINDOW_HEIGHT))
-    
-    background_img_2 = game.assets['night_background.JPG']
-    background_img_2 = pygame.transform.scale(background_img_2, (WINDOW_WIDTH, WINDOW_HEIGHT))
-    
-    # Adversary
-    adversary_img = game.assets['witch.png']
-    adversary_img = pygame.transform.scale(adversary_img, (50, 70))
-    
-    heart_img = game.assets['heart.png']
-    heart_img = pygame.transform.scale(heart_img, (30, 30))
-    
-    pothole_img = game.assets['pothole.png']
-    pothole_img = pygame.transform.scale(pothole_img, (pool_width, pool_height + 10))  # Making it slightly taller for depth effect
-    
-except:
-    print("Couldn't load some images. Using fallback shapes.")
-    player_img = None
-    background_img_1 = None
-    background_img_2 = None
-    adversary_img = None
-    heart_img = None
-    pothole_img = None
+# Assets are loaded in main() and looked up when drawn (already scaled to their
+# draw sizes from ASSET_SPECS); missing ones fall back to plain shapes.
 
 # Load sounds
 try:
-    jump_sound = game.assets['audio.mp3']
     #adversary_sound = pygame.mixer.Sound(os.path.join('assets', 'adversary.wav'))
     #level_complete_sound = pygame.mixer.Sound(os.path.join('assets', 'level_complete.wav'))
     # Sound to be played when cheating
@@ -138,129 +444,19 @@ try:
     cheat_sound = None
 except:
     print("Couldn't load some sounds.")
-    jump_sound = None
     adversary_sound = None
     level_complete_sound = None
     cheat_sound = None
 
-# First, let's create a Particle class to manage individual water particles
-class Particle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.dx = random.uniform(-2, 2)  # Random horizontal velocity
-        self.dy = random.uniform(-4, 0)  # Initial upward velocity
-        self.lifetime = random.randint(20, 40)  # How long the particle lives
-        self.gravity = 0.2
-        self.alpha = 255  # Transparency
-        self.size = random.randint(4, 8)
-
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.dy += self.gravity  # Apply gravity
-        self.lifetime -= 1
-        self.alpha = max(0, self.alpha - 5)  # Fade out
-        
-        
-    def draw(self, screen):
-        if self.lifetime > 0:
-            particle_surface = pygame.Surface((3, 3), pygame.SRCALPHA)
-            pygame.draw.circle(
-                particle_surface, 
-                (64, 164, 223, self.alpha),  # Blue color with alpha
-                (self.size//2, self.size//2),  # Center of circle
-                self.size//2  # Radius
-            )            
-            screen.blit(particle_surface, (int(self.x), int(self.y)))
-
-# Create a class to manage splash effects
-class SplashEffect:
-    def __init__(self, x, y):
-        self.particles = []
-        self.x = x
-        self.y = y
-        self.create_particles()
-
-    def create_particles(self):
-        for _ in range(20):  # Create 20 particles per splash
-            self.particles.append(Particle(self.x, self.y))
-
-    def update(self):
-        # Update all particles and remove dead ones
-        self.particles = [p for p in self.particles if p.lifetime > 0]
-        for particle in self.particles:
-            particle.update()
-
-    def draw(self, screen):
-        for particle in self.particles:
-            particle.draw(screen)
-
-
-class Adversary:
-    def __init__(self):
-        self.width = 50
-        self.height = 70
-        self.x = WINDOW_WIDTH
-        self.y = FLOOR_HEIGHT - self.height
-        self.speed = 5
-        self.jump_timer = 0
-        self.jump_interval = random.randint(60, 120)  # Frames between jumps
-        self.velocity_y = 0
-        self.gravity = 0.8
-        self.jump_speed = -15
-
-    def update(self):
-        self.x -= self.speed
-        self.jump_timer += 1
-        
-        if self.jump_timer >= self.jump_interval:
-            self.jump_timer = 0
-            self.jump_interval = random.randint(60, 120)
-            self.velocity_y = self.jump_speed
-            if adversary_sound:
-                adversary_sound.play()
-
-        self.y += self.velocity_y
-        self.velocity_y += self.gravity
-
-        if self.y >= FLOOR_HEIGHT - self.height:
-            self.y = FLOOR_HEIGHT - self.height
-            self.velocity_y = 0
-
-    def draw(self, screen):
-        if adversary_img:
-            screen.blit(adversary_img, (self.x, self.y))
-        else:
-            pygame.draw.rect(screen, RED, (self.x, self.y, self.width, self.height))
-
-class GameState:
-    def __init__(self):
-        self.lives = 3
-        self.score = 0
-        self.level = 1
-        self.game_speed = 5
-        self.is_invulnerable = False
-        self.invulnerable_timer = 0
-        self.invulnerable_duration = 2000
-        self.distance_covered = 0
-        self.level_length = 5000  # Increased level length (adjust as needed)
-        self.transitioning = False
-        self.transition_start = 0
-        self.transition_duration = 2000  # 2 seconds
-        self.max_level = 3  # Cap at level 3
-        self.cheat_activated = False  # Track if cheat is activated
-
-    def activate_level_2(self):
-        self.level = 2
-        self.distance_covered = 0
-        self.cheat_activated = True
-        if cheat_sound:
-            cheat_sound.play()
-        return self.reset_player_position()
-    
-    def reset_player_position(self):
-        return 100, FLOOR_HEIGHT - player_height
+def draw_adversary(screen, adversary, alpha=1.0):
+    # Interpolate between the last two simulation steps
+    x = adversary.prev_x + (adversary.x - adversary.prev_x) * alpha
+    y = adversary.prev_y + (adversary.y - adversary.prev_y) * alpha
+    adversary_img = game.assets.get('witch.png')
+    if adversary_img:
+        return screen.blit(adversary_img, (x, y))
+    else:
+        return pygame.draw.rect(screen, RED, (x, y, adversary.width, adversary.height))
 
 def change_background_music(level):
     pygame.mixer.music.stop()
@@ -271,324 +467,314 @@ def change_background_music(level):
     except:
         print(f"Couldn't load music for level {level}")
 
-def level_transition(game_state):
-    screen.fill(BLACK)
-    font = pygame.font.Font(None, 74)
-    text = font.render(f"Level {game_state.level}", True, WHITE)
-    text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-    screen.blit(text, text_rect)
-    pygame.display.flip()
-    time.sleep(2)
-    
-    # Reset level state
-    game_state.distance_covered = 0
-    pools.clear()
-    change_background_music(game_state.level)
-    return []  # Return empty adversaries list
-
-def draw_lives(screen, lives):
-    if heart_img:
-        for i in range(lives):
-            screen.blit(heart_img, (10 + i * 35, 10))
-    else:
-        for i in range(lives):
-            pygame.draw.circle(screen, RED, (25 + i * 35, 25), 10)
-            
-def draw_pothole(screen, x, y):
-    if pothole_img:
-        screen.blit(pothole_img, (x, y))
-    else:
-        pygame.draw.ellipse(screen, GRAY, (x, y, pool_width, pool_height + 5))
-        pygame.draw.ellipse(screen, BLUE, (x + 5, y + 5, pool_width - 10, pool_height - 5))
-    
-    # # Add ambient water particles
-    # if random.random() < 0.1:  # 10% chance each frame to create a new particle
-    #     water_particles.append(Particle(
-    #         x + random.randint(10, pool_width - 10),
-    #         y + pool_height//2
-    #     ))
-
-def show_start_screen():
-    screen.fill(BLACK)
-    font_large = pygame.font.Font(None, 74)
-    font_small = pygame.font.Font(None, 36)
-    
-    # Title
-    title = font_large.render("Choota Pandit Jump", True, WHITE)
-    title_rect = title.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/3))
-    
-    # Instructions
-    instructions = font_small.render("Press SPACE to Start", True, WHITE)
-    inst_rect = instructions.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-    
-    screen.blit(title, title_rect)
-    screen.blit(instructions, inst_rect)
-    pygame.display.flip()
-    
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_SPACE:
-                    return True
-    return False
-
-
-
-
-show_start_screen()
-      
-# Game loop
-# Initialize game state
-game_state = GameState()
-
-# Player properties
-player_width = 40
-player_height = 60
-player_x, player_y = game_state.reset_player_position()
-player_speed = 5
-jump_speed = -15
-gravity = 0.8
-
-player_velocity_y = 0
-is_jumping = False
-
-
-clock = pygame.time.Clock()
-running = True
-#game_state = GameState()
-#pools = []
-adversaries = []
-splash_effects = []
-water_particles = []
-
-# Start background music
-change_background_music(1)
-
-def level_transition(game_state):
-    screen.fill(BLACK)
-    font = pygame.font.Font(None, 74)
-    if game_state.cheat_activated:
-        text = font.render("CHEAT ACTIVATED", True, (255, 255, 0))
-        text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 50))
-        screen.blit(text, text_rect)
-        
-    text = font.render(f"Level {game_state.level}", True, WHITE)
-    text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 50))
-    screen.blit(text, text_rect)
-    pygame.display.flip()
-    time.sleep(2)
-    
-    # Reset level state
-    game_state.distance_covered = 0
-    pools.clear()
-    change_background_music(game_state.level)
-    return []
-
-while running:
-    current_time = pygame.time.get_ticks()
-    
-    # Update game state
-    game_state.distance_covered += game_state.game_speed
+def draw_world(renderer, sim, alpha):
+    """Draw the simulation, interpolated alpha of the way into the next step"""
+    game_state = sim.game_state
+    profiler = game.profiler
 
-    # Generate water pools (only in levels 1 and 3)
-    if game_state.level == 1 or game_state.level == 3:
-        # In the main game loop where pools are drawn
-        if len(pools) == 0 or pools[-1][0] < WINDOW_WIDTH - 300:
-            pools.append([WINDOW_WIDTH, FLOOR_HEIGHT - pool_height])
-        
-        
-        
-
-    # Generate adversaries (only in levels 2 and 3)
-    if game_state.level >= 2:
-        if len(adversaries) == 0 or adversaries[-1].x < WINDOW_WIDTH - 400:
-            adversaries.append(Adversary())
+    # Background and ground come from one cached backdrop; a new one forces a full frame
+    renderer.begin_frame(get_backdrop(level_background(game_state.level)))
+    profiler.mark('background')
 
-    # Update pools and adversaries
-    for pool in pools:
-        pool[0] -= game_state.game_speed
-    pools = [pool for pool in pools if pool[0] > -pool_width]
-
-    for adversary in adversaries:
-        adversary.update()
-    adversaries = [adv for adv in adversaries if adv.x > -adv.width]
-    
-    # Update existing effects
-    for splash in splash_effects:
-        splash.update()
-    splash_effects = [splash for splash in splash_effects if splash.particles]
-
-    # Update water particles
-    for particle in water_particles:
-        particle.update()
-    water_particles = [p for p in water_particles if p.lifetime > 0]
-    
-    # Level transition
-    if game_state.distance_covered >= game_state.level_length and not game_state.transitioning:
-        if game_state.level < game_state.max_level:
-            game_state.transitioning = True
-            game_state.transition_start = current_time
-            game_state.level += 1
-            if level_complete_sound:
-                level_complete_sound.play()
-            # Clear all obstacles during transition
-            pools.clear()
-            adversaries.clear()
-            adversaries = level_transition(game_state)
-            game_state.transitioning = False
+    # Draw player with blinking effect when invulnerable
+    if not game_state.is_invulnerable or (int(sim.time_ms) // 200) % 2:
+        player_x = sim.prev_player_x + (sim.player_x - sim.prev_player_x) * alpha
+        player_y = sim.prev_player_y + (sim.player_y - sim.prev_player_y) * alpha
+        player_img = game.assets.get('hero.png')
+        if player_img:
+            renderer.track(screen.blit(player_img, (player_x, player_y)))
         else:
-            running = False  # Or implement victory screen
+            renderer.track(pygame.draw.rect(screen, BROWN, (player_x, player_y, player_width, player_height)))
 
-    # Regular game loop
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE and not is_jumping:
-                player_velocity_y = jump_speed
-                is_jumping = True
-                if jump_sound:
-                    jump_sound.play()
-                    jump_sound.set_volume(0.3)
+    # Draw pools (only in levels 1 and 3)
+    if game_state.level == 1 or game_state.level == 3:
+        for pool in sim.pools:
+            renderer.track(draw_pothole(screen, pool[2] + (pool[0] - pool[2]) * alpha, pool[1]))
+        profiler.mark('entities')
 
-            # Cheat code using key 4
-            if event.key == pygame.K_4:
-                player_x, player_y = game_state.activate_level_2()
-                player_velocity_y = 0
-                pools.clear()  # Clear pools as level 2 doesn't have them
-                adversaries.clear()  # Clear existing adversaries
-                if level_complete_sound:
-                    level_complete_sound.play()
-                # Show level 2 transition screen
-                level_transition(game_state)
-    
+        # Draw all particle effects
+        renderer.track(sim.particles.draw(screen, doreturn=True))
+        profiler.mark('particles')
 
-    # Update player position
-    player_y += player_velocity_y
-    player_velocity_y += gravity
+    # Draw adversaries (only in levels 2 and 3)
+    if game_state.level >= 2:
+        for adversary in sim.adversaries:
+            renderer.track(draw_adversary(screen, adversary, alpha))
+    profiler.mark('entities')
 
-    # Ground collision
-    if player_y >= FLOOR_HEIGHT - player_height:
-        player_y = FLOOR_HEIGHT - player_height
-        player_velocity_y = 0
-        is_jumping = False
+    # Draw lives and level
+    renderer.track(game.hud.draw_lives(screen, game_state.lives, game.assets.get('heart.png')))
+    renderer.track(game.hud.draw_cheat_indicator(screen, game_state.cheat_activated))
+    renderer.track(game.hud.draw_level(screen, game_state.level))
+    profiler.mark('hud')
 
+    renderer.track(profiler.draw_overlay(screen, game.hud))
+    profiler.mark('overlay')
 
+def draw_pothole(screen, x, y):
+    pothole_img = game.assets.get('pothole.png')
+    if pothole_img:
+        return screen.blit(pothole_img, (x, y))
+    else:
+        rect = pygame.draw.ellipse(screen, GRAY, (x, y, pool_width, pool_height + 5))
+        pygame.draw.ellipse(screen, BLUE, (x + 5, y + 5, pool_width - 10, pool_height - 5))
+        return rect
+
+def level_background(level):
+    """Get the background image for a level, or None to draw the plain fallback"""
+    # Levels 2 and 3 share the night background
+    if level == 1:
+        return game.assets.get('day_background1.jpg')
+    return game.assets.get('night_background.JPG')
+
+# Composited background image plus ground, keyed by the background surface
+backdrops = {}
+
+def get_backdrop(background_img):
+    """Get the static backdrop the renderer restores each frame from"""
+    backdrop = backdrops.get(background_img)
+    if backdrop is None:
+        backdrop = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        if background_img:
+            backdrop.blit(background_img, (0, 0))
+        else:
+            backdrop.fill(WHITE)
 
-   
+        # Draw ground
+        pygame.draw.rect(backdrop, GRAY, (0, FLOOR_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT - FLOOR_HEIGHT))
+        backdrops[background_img] = backdrop
+    return backdrop
 
-    # Collision detection
-    player_rect = pygame.Rect(player_x, player_y, player_width, player_height)
-    
-     # Pool collisions (only check if in level 1 or 3)
-    if game_state.level == 1 or game_state.level == 3:
-        # for pool in pools:
-        #     pool_rect = pygame.Rect(pool[0], pool[1], pool_width, pool_height)
-        #     if player_rect.colliderect(pool_rect) and not game_state.is_invulnerable:
-        #         game_state.lives -= 1
-        #         game_state.is_invulnerable = True
-        #         game_state.invulnerable_timer = current_time
-        #         if game_state.lives <= 0:
-        #             running = False
-        #         else:
-        #             player_x, player_y = game_state.reset_player_position()
-        #             player_velocity_y = 0
-        # Adjust the collision detection for more realistic pothole interaction
-        for pool in pools:
-            if (player_x + player_width > pool[0] + 10 and 
-                player_x < pool[0] + pool_width - 10 and 
-                player_y + player_height > pool[1]):
-                if not game_state.is_invulnerable:
-                    game_state.lives -= 1
-                    game_state.is_invulnerable = True
-                    game_state.invulnerable_timer = current_time
-                    # Add splash effect
-                    splash_effects.append(SplashEffect(
-                        pool[0] + pool_width//2,
-                        pool[1] + pool_height//2
-                    ))
-                    if game_state.lives <= 0:
-                        running = False
-                    else:
-                        player_x, player_y = game_state.reset_player_position()
-                        player_velocity_y = 0
-        
+class StartScene(Scene):
+    """Title screen, waiting for SPACE"""
+    def __init__(self):
+        self.started = False
 
-    # Adversary collisions (only check if in level 2 or 3)
-    if game_state.level >= 2:
-        for adversary in adversaries:
-            adversary_rect = pygame.Rect(adversary.x, adversary.y, adversary.width, adversary.height)
-            if player_rect.colliderect(adversary_rect) and not game_state.is_invulnerable:
-                game_state.lives -= 1
-                game_state.is_invulnerable = True
-                game_state.invulnerable_timer = current_time
-                if game_state.lives <= 0:
-                    running = False
-                else:
-                    player_x, player_y = game_state.reset_player_position()
-                    player_velocity_y = 0
-
-    # Drawing section
-    def draw_cheat_indicator(screen, game_state):
-        if game_state.cheat_activated:
-            font = pygame.font.Font(None, 24)
-            text = font.render("CHEAT MODE", True, (255, 255, 0))
-            screen.blit(text, (10, WINDOW_HEIGHT - 30))
-        
-    background_img = background_img_1 if game_state.level == 1 else background_img_2
-    if game_state.level == 3:
-        background_img = background_img_2  # Use different background for level 3 if available
-    
-    if background_img:
-        screen.blit(background_img, (0, 0))
-    else:
-        screen.fill(WHITE)
+    def handle_event(self, event):
+        if event.type == pygame.KEYUP and event.key == pygame.K_SPACE:
+            self.started = True
 
-    # Draw ground
-    pygame.draw.rect(screen, GRAY, (0, FLOOR_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT - FLOOR_HEIGHT))
+    def update(self, dt_ms):
+        if self.started:
+            return PlayingScene()
+        return self
 
-    if game_state.is_invulnerable:
-        if current_time - game_state.invulnerable_timer >= game_state.invulnerable_duration:
-            game_state.is_invulnerable = False
-            
-   # Draw player with blinking effect when invulnerable
-    if not game_state.is_invulnerable or (current_time // 200) % 2:
-        if player_img:
-            screen.blit(player_img, (player_x, player_y))
-        else:
-            pygame.draw.rect(screen, BROWN, (player_x, player_y, player_width, player_height))
-                 
-     # Draw pools (only in levels 1 and 3)
-    if game_state.level == 1 or game_state.level == 3:
-        # for pool in pools:
-        #     pygame.draw.rect(screen, BLUE, (pool[0], pool[1], pool_width, pool_height))
-        for pool in pools:
-            draw_pothole(screen, pool[0], pool[1])
-            
-        
-        # Draw all particle effects
-        for splash in splash_effects:
-            splash.draw(screen)
-        
-        for particle in water_particles:
-            particle.draw(screen)
-    
-    # Draw adversaries (only in levels 2 and 3)
-    if game_state.level >= 2:
-        for adversary in adversaries:
-            adversary.draw(screen)
+    def draw(self, renderer):
+        screen.fill(BLACK)
+        game.hud.draw_text(screen, "Choota Pandit Jump", 74, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/3))
+        game.hud.draw_text(screen, "Press SPACE to Start", 36, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
 
-    # Draw lives and level
-    draw_lives(screen, game_state.lives)
-    draw_cheat_indicator(screen, game_state)
-    font = pygame.font.Font(None, 36)
-    level_text = font.render(f"Level: {game_state.level}", True, WHITE)
-    screen.blit(level_text, (WINDOW_WIDTH - 120, 10))
 
-    pygame.display.flip()
-    clock.tick(60)
+class PlayingScene(Scene):
+    """Gameplay: fixed simulation steps for the real time covered, interpolated drawing"""
+    max_fps = MAX_FPS
 
-pygame.quit()
+    def __init__(self):
+        self.sim = GameSimulation()
+        self.sim.profiler = game.profiler
+        # Input is held until the next simulation step consumes it
+        self.jump_pressed = False
+        self.cheat_pressed = False
+        self.accumulator = 0.0
+        self.music_started = False
+
+    def enter(self):
+        # Time spent on other screens is not simulated
+        self.accumulator = 0.0
+        if not self.music_started:
+            change_background_music(self.sim.game_state.level)
+            self.music_started = True
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.jump_pressed = True
+            # Cheat code using key 4
+            if event.key == pygame.K_4:
+                self.cheat_pressed = True
+
+    def update(self, dt_ms):
+        # Run as many fixed steps as real time has covered; a slow frame catches up
+        # with extra steps instead of slowing the game down
+        sim = self.sim
+        self.accumulator += dt_ms
+        while self.accumulator >= STEP_MS:
+            inputs = []
+            if self.jump_pressed:
+                inputs.append('jump')
+            if self.cheat_pressed:
+                inputs.append('cheat')
+            self.jump_pressed = self.cheat_pressed = False
+            self.accumulator -= STEP_MS
+
+            for sim_event in sim.step(inputs):
+                if sim_event == 'jump':
+                    jump_sound = game.assets.get('audio.mp3')
+                    if jump_sound:
+                        jump_sound.play()
+                        jump_sound.set_volume(0.3)
+                elif sim_event == 'adversary_jump':
+                    if adversary_sound:
+                        adversary_sound.play()
+                elif sim_event in ('level_up', 'cheat'):
+                    if sim_event == 'cheat' and cheat_sound:
+                        cheat_sound.play()
+                    if level_complete_sound:
+                        level_complete_sound.play()
+                    # Show the new level's transition screen, then carry on from here
+                    return TransitionScene(self)
+            if not sim.running:
+                return GameOverScene(sim.game_state)
+        return self
+
+    def draw(self, renderer):
+        draw_world(renderer, self.sim, self.accumulator / STEP_MS)
+
+
+def warm_level(level):
+    """Prepare a level's assets and caches one small piece of work at a time"""
+    # Decode whatever the background prefetch has already downloaded
+    while game.load_prefetched():
+        yield
+    game.ensure_level(level)
+    yield
+    # Composite the backdrop and render the HUD label before the first frame needs them
+    get_backdrop(level_background(level))
+    yield
+    game.hud.render(f"Level: {level}", 36, WHITE)
+    yield
+    change_background_music(level)
+
+
+class TransitionScene(Scene):
+    """The level banner, shown for TRANSITION_MS while the next level warms up"""
+    def __init__(self, playing):
+        self.playing = playing
+        self.game_state = playing.sim.game_state
+        self.remaining = TRANSITION_MS
+        self.work = warm_level(self.game_state.level)
+
+    def update(self, dt_ms):
+        # One piece of warm-up per frame keeps the window responsive
+        if self.work is not None:
+            try:
+                next(self.work)
+            except StopIteration:
+                self.work = None
+        self.remaining -= dt_ms
+        if self.remaining > 0:
+            return self
+        # Whatever is left must be ready before play resumes
+        if self.work is not None:
+            for _ in self.work:
+                pass
+        return self.playing
+
+    def draw(self, renderer):
+        screen.fill(BLACK)
+        if self.game_state.cheat_activated:
+            game.hud.draw_text(screen, "CHEAT ACTIVATED", 74, (255, 255, 0),
+                               center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 50))
+        game.hud.draw_text(screen, f"Level {self.game_state.level}", 74, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 50))
+
+
+class GameOverScene(Scene):
+    """End screen after the last life or the last level; SPACE plays again"""
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.choice = None
+        self.grace = GAME_OVER_GRACE_MS
+
+    def enter(self):
+        pygame.mixer.music.stop()
+
+    def handle_event(self, event):
+        # Act on presses, not releases, and only once the grace period is over, so
+        # a jump key held or mashed at the moment of death cannot restart at once
+        if event.type == pygame.KEYDOWN and self.grace <= 0:
+            if event.key == pygame.K_SPACE:
+                self.choice = 'again'
+            elif event.key == pygame.K_ESCAPE:
+                self.choice = 'quit'
+
+    def update(self, dt_ms):
+        self.grace -= dt_ms
+        if self.choice == 'again':
+            return PlayingScene()
+        if self.choice == 'quit':
+            return None
+        return self
+
+    def draw(self, renderer):
+        screen.fill(BLACK)
+        title = "GAME OVER" if self.game_state.lives <= 0 else "YOU WIN!"
+        game.hud.draw_text(screen, title, 74, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/3))
+        game.hud.draw_text(screen, f"Reached level {self.game_state.level}", 36, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
+        game.hud.draw_text(screen, "SPACE to play again, ESC to quit", 36, WHITE,
+                           center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 50))
+
+
+async def main():
+    # Load level 1 assets from S3 cache; later levels are prefetched while playing
+    await game.load_assets(level=1)
+    game.prefetch_assets()
+
+    # Every screen runs in this one loop, paced by the clock and yielding each frame
+    clock = pygame.time.Clock()
+    renderer = create_renderer(screen, RENDERER)
+    scenes = SceneManager(renderer, StartScene())
+    profiler = game.profiler
+    dt_ms = 0
+    first_frame = True
+    clock.tick()
+
+    while scenes.running:
+        profiler.begin_frame()
+        # Pick up at most one prefetched later-level asset per frame
+        game.load_prefetched()
+        profiler.mark('prefetch')
+
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                scenes.quit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+        profiler.mark('events')
+        if not scenes.running:
+            break
+
+        scenes.frame(events, dt_ms)
+        profiler.mark('scene')
+        renderer.present()
+        profiler.mark('present')
+        if first_frame:
+            first_frame = False
+            elapsed = time.perf_counter() - STARTED
+            game.telemetry.observe('game_first_frame_seconds', elapsed, source=game.asset_source)
+            hits = game.telemetry.total('asset_cache_hits_total')
+            lookups = hits + game.telemetry.total('asset_cache_misses_total')
+            hit_ratio = f", cache hit ratio {hits / lookups:.0%}" if lookups else ""
+            print(f"First frame after {elapsed * 1000:.0f} ms "
+                  f"(assets from {game.asset_source}{hit_ratio})")
+
+        max_fps = scenes.scene.max_fps if scenes.running else MAX_FPS
+        dt_ms = min(clock.tick(max_fps), MAX_FRAME_MS)
+        await asyncio.sleep(0)
+        profiler.mark('wait')
+        profiler.end_frame()
+
+    profiler.export()
+    game.export_telemetry()
+    if game.decode_pool is not None:
+        game.decode_pool.shutdown()
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
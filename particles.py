@@ -0,0 +1,91 @@
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Water particles kept in preallocated arrays and updated in vectorized batches"""
+    def __init__(self, capacity=4096, gravity=0.2, color=(64, 164, 223),
+                 alpha_buckets=16, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.color = color
+        self.alpha_buckets = alpha_buckets
+        self.rng = np.random.default_rng(seed)
+
+        # Live particles are packed into [0, count) so every update is a slice
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.alpha = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+
+        # Pre-rendered circles keyed by (size, alpha bucket)
+        self.sprites = {}
+
+    def emit(self, x, y, count=20):
+        """Spawn particles at a point; extra particles are dropped when full"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        new = slice(self.count, self.count + count)
+        self.x[new] = x
+        self.y[new] = y
+        self.dx[new] = self.rng.uniform(-2, 2, count)  # Random horizontal velocity
+        self.dy[new] = self.rng.uniform(-4, 0, count)  # Initial upward velocity
+        self.lifetime[new] = self.rng.integers(20, 41, count)  # How long each particle lives
+        self.alpha[new] = 255
+        self.size[new] = self.rng.integers(4, 9, count)
+        self.count += count
+
+    def emit_splash(self, x, y):
+        """Spawn the 20-particle burst used when the player lands in a pool"""
+        self.emit(x, y, 20)
+
+    def update(self, scale=1.0):
+        """Advance every live particle by scale 60 Hz frames and drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.dx[:n] * scale
+        self.y[:n] += self.dy[:n] * scale
+        self.dy[:n] += self.gravity * scale  # Apply gravity
+        self.lifetime[:n] -= scale
+        np.maximum(self.alpha[:n] - 5 * scale, 0, out=self.alpha[:n])  # Fade out
+
+        alive = self.lifetime[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            for values in (self.x, self.y, self.dx, self.dy, self.lifetime, self.alpha, self.size):
+                values[:live] = values[:n][alive]
+            self.count = live
+
+    def get_sprite(self, size, bucket):
+        """Get the pre-rendered circle for a size and alpha bucket"""
+        key = (size, bucket)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = bucket * 255 // (self.alpha_buckets - 1)
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.color, alpha), (size // 2, size // 2), size // 2)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen, doreturn=False):
+        """Blit every live particle in one batch, optionally returning their rects"""
+        n = self.count
+        if n == 0:
+            return [] if doreturn else None
+        buckets = (self.alpha[:n] * (self.alpha_buckets - 1) / 255).round().astype(np.int32)
+        xs = self.x[:n].astype(np.int32).tolist()
+        ys = self.y[:n].astype(np.int32).tolist()
+        get_sprite = self.get_sprite
+        return screen.blits([(get_sprite(size, bucket), (x, y))
+                             for size, bucket, x, y in zip(self.size[:n].tolist(), buckets.tolist(), xs, ys)],
+                            doreturn=doreturn)
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
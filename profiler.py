@@ -0,0 +1,123 @@
+import csv
+import json
+import time
+from collections import deque
+
+YELLOW = (255, 255, 0)
+WHITE = (255, 255, 255)
+
+
+class FrameProfiler:
+    """Named phase timers for the main loop, with a rolling overlay and sample export
+
+    Each mark(phase) charges the time since the previous mark to that phase, so a
+    frame costs one perf_counter call per phase while recording and an attribute
+    check otherwise.
+    """
+    def __init__(self, window=240, export_path=None, refresh_frames=30):
+        self.window = window
+        self.export_path = export_path
+        self.refresh_frames = refresh_frames
+        self.show_overlay = False
+        # Record whenever someone will look at the numbers
+        self.enabled = export_path is not None
+        self.history = deque(maxlen=window)  # Recent frames for the overlay
+        self.samples = []  # Every recorded frame, kept only for export
+        self.frames = 0
+        self.current = {}
+        self.last = None
+        self.lines = []
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, recording only while someone needs the data"""
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.export_path is not None
+        self.last = None
+        self.lines = []
+
+    def begin_frame(self):
+        """Start timing a main-loop iteration"""
+        if not self.enabled:
+            return
+        self.current = {}
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the last mark to phase"""
+        if not self.enabled or self.last is None:
+            return
+        now = time.perf_counter()
+        current = self.current
+        current[phase] = current.get(phase, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        """Finish the frame and add it to the rolling window and export samples"""
+        if not self.enabled or self.last is None:
+            return
+        frame = self.current
+        frame['frame'] = sum(frame.values())
+        self.history.append(frame)
+        if self.export_path is not None:
+            self.samples.append(frame)
+        self.frames += 1
+        self.last = None
+
+    def percentiles(self, points=(50, 95, 99)):
+        """Frame time percentiles (ms) over the rolling window"""
+        ordered = sorted(frame['frame'] for frame in self.history)
+        if not ordered:
+            return {}
+        last = len(ordered) - 1
+        return {p: ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+    def phase_means(self):
+        """Mean ms per frame spent in each phase over the rolling window"""
+        totals = {}
+        for frame in self.history:
+            for phase, ms in frame.items():
+                if phase != 'frame':
+                    totals[phase] = totals.get(phase, 0.0) + ms
+        count = len(self.history) or 1
+        return {phase: total / count for phase, total in totals.items()}
+
+    def summary_lines(self):
+        """Overlay text: frame time percentiles then phases by cost"""
+        pct = self.percentiles()
+        if not pct:
+            return ["profiling..."]
+        lines = [f"frame p50 {pct[50]:.2f}  p95 {pct[95]:.2f}  p99 {pct[99]:.2f} ms"]
+        means = sorted(self.phase_means().items(), key=lambda item: item[1], reverse=True)
+        lines.extend(f"{phase:<10} {ms:6.2f} ms" for phase, ms in means)
+        return lines
+
+    def draw_overlay(self, screen, hud, pos=(10, 60)):
+        """Draw the overlay, refreshing its numbers every refresh_frames frames"""
+        if not self.show_overlay:
+            return None
+        if not self.lines or self.frames % self.refresh_frames == 0:
+            self.lines = self.summary_lines()
+        x, y = pos
+        rects = []
+        for i, line in enumerate(self.lines):
+            rects.append(hud.draw_text(screen, line, 20, YELLOW if i == 0 else WHITE, (x, y + i * 16)))
+        return rects
+
+    def export(self, path=None):
+        """Write the recorded per-frame samples as CSV or JSON, chosen by extension"""
+        path = path or self.export_path
+        if path is None or not self.samples:
+            return None
+        phases = sorted({phase for frame in self.samples for phase in frame if phase != 'frame'})
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'phases': phases, 'frames': self.samples}, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'frame_ms'] + [f"{phase}_ms" for phase in phases])
+                for i, frame in enumerate(self.samples):
+                    writer.writerow([i, round(frame['frame'], 4)] +
+                                    [round(frame.get(phase, 0.0), 4) for phase in phases])
+        print(f"Wrote {len(self.samples)} frame samples to {path}")
+        return path
@@ -0,0 +1,71 @@
+import pygame
+
+
+class FullRenderer:
+    """Redraws the whole frame from the backdrop and flips the display"""
+    def __init__(self, screen):
+        self.screen = screen
+
+    def begin_frame(self, backdrop):
+        """Start a frame by restoring the static backdrop"""
+        self.screen.blit(backdrop, (0, 0))
+
+    def track(self, rects):
+        """Record the screen area touched by a draw call (a rect, list of rects or None)"""
+
+    def invalidate(self):
+        """Force the next frame to redraw and present the whole screen"""
+
+    def present(self):
+        """Show the finished frame"""
+        pygame.display.flip()
+
+
+class DirtyRectRenderer(FullRenderer):
+    """Restores and updates only the regions entities covered this frame or the last"""
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.backdrop = None
+        self.full_redraw = True
+        self.previous = []
+        self.current = []
+
+    def begin_frame(self, backdrop):
+        # A new backdrop (level change, background swap) needs a full frame
+        if backdrop is not self.backdrop:
+            self.backdrop = backdrop
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.screen.blit(backdrop, (0, 0))
+        else:
+            # Erase last frame's entities by copying the backdrop back over them
+            for rect in self.previous:
+                self.screen.blit(backdrop, rect, rect)
+
+    def track(self, rects):
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            self.current.append(rects)
+        else:
+            self.current.extend(rect for rect in rects if rect is not None)
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def present(self):
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+
+
+def create_renderer(screen, mode='full'):
+    """Create the renderer selected at startup"""
+    if mode == 'dirty':
+        return DirtyRectRenderer(screen)
+    return FullRenderer(screen)
@@ -0,0 +1,51 @@
+class Scene:
+    """One screen of the game, driven a frame at a time by the SceneManager"""
+    # Static screens need far fewer frames than gameplay
+    max_fps = 30
+
+    def enter(self):
+        """Called when the scene becomes active"""
+
+    def handle_event(self, event):
+        """React to one pygame event"""
+
+    def update(self, dt_ms):
+        """Advance by dt_ms; return the scene to run next frame, or None to quit"""
+        return self
+
+    def draw(self, renderer):
+        """Draw the frame; the manager presents it afterwards"""
+
+
+class SceneManager:
+    """Runs the active scene inside the one frame-paced loop and switches between scenes"""
+    def __init__(self, renderer, scene):
+        self.renderer = renderer
+        self.scene = None
+        self.switch(scene)
+
+    @property
+    def running(self):
+        return self.scene is not None
+
+    def switch(self, scene):
+        """Make scene active; None stops the loop"""
+        self.scene = scene
+        if scene is not None:
+            # The new scene owns the whole screen, so its first frame is a full one
+            self.renderer.invalidate()
+            scene.enter()
+
+    def quit(self):
+        self.scene = None
+
+    def frame(self, events, dt_ms):
+        """Run one frame: events, update, then draw whichever scene is active"""
+        scene = self.scene
+        for event in events:
+            scene.handle_event(event)
+        next_scene = scene.update(dt_ms)
+        if next_scene is not scene:
+            self.switch(next_scene)
+        if self.scene is not None:
+            self.scene.draw(self.renderer)
@@ -0,0 +1,299 @@
+import random
+from particles import ParticleSystem
+
+# World geometry
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 400
+FLOOR_HEIGHT = 300
+
+# Player properties
+player_width = 40
+player_height = 60
+player_speed = 5
+jump_speed = -15
+gravity = 0.8
+
+# Water pool properties
+pool_width = 80
+pool_height = 20
+
+# Fixed-timestep simulation: physics always runs at PHYSICS_HZ and rendering
+# interpolates between steps. Speeds and timers are tuned per 60 Hz frame, so each
+# step advances STEP_SCALE of one.
+PHYSICS_HZ = 120
+STEP_MS = 1000 / PHYSICS_HZ
+STEP_SCALE = 60 / PHYSICS_HZ
+
+
+class Adversary:
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.width = 50
+        self.height = 70
+        self.x = WINDOW_WIDTH
+        self.y = FLOOR_HEIGHT - self.height
+        self.speed = 5
+        self.jump_timer = 0
+        self.jump_interval = rng.randint(60, 120)  # Frames between jumps
+        self.velocity_y = 0
+        self.gravity = 0.8
+        self.jump_speed = -15
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def update(self, scale=1.0):
+        """Advance by scale 60 Hz frames; returns True when the adversary jumps"""
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x -= self.speed * scale
+        self.jump_timer += scale
+
+        jumped = False
+        if self.jump_timer >= self.jump_interval:
+            self.jump_timer = 0
+            self.jump_interval = self.rng.randint(60, 120)
+            self.velocity_y = self.jump_speed
+            jumped = True
+
+        self.y += self.velocity_y * scale
+        self.velocity_y += self.gravity * scale
+
+        if self.y >= FLOOR_HEIGHT - self.height:
+            self.y = FLOOR_HEIGHT - self.height
+            self.velocity_y = 0
+        return jumped
+
+class GameState:
+    def __init__(self):
+        self.lives = 3
+        self.score = 0
+        self.level = 1
+        self.game_speed = 5
+        self.is_invulnerable = False
+        self.invulnerable_timer = 0
+        self.invulnerable_duration = 2000
+        self.distance_covered = 0
+        self.level_length = 5000  # Increased level length (adjust as needed)
+        self.transitioning = False
+        self.transition_start = 0
+        self.transition_duration = 2000  # 2 seconds
+        self.max_level = 3  # Cap at level 3
+        self.cheat_activated = False  # Track if cheat is activated
+
+    def activate_level_2(self):
+        self.level = 2
+        self.distance_covered = 0
+        self.cheat_activated = True
+        return self.reset_player_position()
+
+    def reset_player_position(self):
+        return 100, FLOOR_HEIGHT - player_height
+
+class GameSimulation:
+    """Game state advanced in fixed steps, with no display, audio or assets"""
+    def __init__(self, seed=None, step_scale=STEP_SCALE, particles=True, ambient_particles=True):
+        # All randomness comes from one seeded generator so runs are reproducible
+        self.rng = random.Random(seed)
+        self.step_scale = step_scale
+        self.step_ms = step_scale * 1000 / 60
+        self.time_ms = 0
+        self.steps = 0
+        self.running = True
+        # Things that happened during the last step, for sounds and screens
+        self.events = []
+
+        self.game_state = GameState()
+        self.player_x, self.player_y = self.game_state.reset_player_position()
+        self.player_velocity_y = 0
+        self.is_jumping = False
+        self.pools = []  # [x, y, previous x]
+        self.adversaries = []
+        self.particles = ParticleSystem(seed=self.rng.getrandbits(32)) if particles else None
+        self.ambient_particles = ambient_particles and particles
+        # Optional FrameProfiler charged for spawn, update and collision time
+        self.profiler = None
+        self.sync_previous()
+
+    def sync_previous(self):
+        """Forget the previous player position so a teleport is not interpolated"""
+        self.prev_player_x, self.prev_player_y = self.player_x, self.player_y
+
+    def reset_player(self):
+        self.player_x, self.player_y = self.game_state.reset_player_position()
+        self.player_velocity_y = 0
+        self.sync_previous()
+
+    def lose_life(self):
+        game_state = self.game_state
+        game_state.lives -= 1
+        game_state.is_invulnerable = True
+        game_state.invulnerable_timer = self.time_ms
+        if game_state.lives <= 0:
+            self.running = False
+            self.events.append('game_over')
+        else:
+            self.reset_player()
+
+    def step(self, inputs=()):
+        """Advance the simulation by one fixed step; inputs holds 'jump' and/or 'cheat'"""
+        scale = self.step_scale
+        game_state = self.game_state
+        pools = self.pools
+        profiler = self.profiler
+        self.events.clear()
+        self.steps += 1
+        self.time_ms += self.step_ms
+        self.prev_player_x, self.prev_player_y = self.player_x, self.player_y
+
+        # Update game state
+        game_state.distance_covered += game_state.game_speed * scale
+
+        # Generate water pools (only in levels 1 and 3)
+        if game_state.level == 1 or game_state.level == 3:
+            if len(pools) == 0 or pools[-1][0] < WINDOW_WIDTH - 300:
+                pools.append([WINDOW_WIDTH, FLOOR_HEIGHT - pool_height, WINDOW_WIDTH])
+
+        # Generate adversaries (only in levels 2 and 3)
+        if game_state.level >= 2:
+            if len(self.adversaries) == 0 or self.adversaries[-1].x < WINDOW_WIDTH - 400:
+                self.adversaries.append(Adversary(self.rng))
+        if profiler is not None:
+            profiler.mark('spawn')
+
+        # Update pools and adversaries
+        for pool in pools:
+            pool[2] = pool[0]
+            pool[0] -= game_state.game_speed * scale
+        pools[:] = [pool for pool in pools if pool[0] > -pool_width]
+
+        # Add ambient water particles
+        if self.ambient_particles and (game_state.level == 1 or game_state.level == 3):
+            for pool in pools:
+                if self.rng.random() < 0.1 * scale:  # 10% chance per frame to create a new particle
+                    self.particles.emit(pool[0] + self.rng.randint(10, pool_width - 10),
+                                        pool[1] + pool_height//2, 1)
+
+        for adversary in self.adversaries:
+            if adversary.update(scale):
+                self.events.append('adversary_jump')
+        self.adversaries = [adv for adv in self.adversaries if adv.x > -adv.width]
+
+        # Update splash and water particles
+        if self.particles is not None:
+            self.particles.update(scale)
+
+        # Level transition
+        if game_state.distance_covered >= game_state.level_length:
+            if game_state.level < game_state.max_level:
+                game_state.level += 1
+                game_state.distance_covered = 0
+                # Clear all obstacles during transition
+                pools.clear()
+                self.adversaries.clear()
+                self.events.append('level_up')
+            else:
+                self.running = False  # Or implement victory screen
+                self.events.append('victory')
+
+        # Apply this step's input
+        if 'jump' in inputs and not self.is_jumping:
+            self.player_velocity_y = jump_speed
+            self.is_jumping = True
+            self.events.append('jump')
+
+        # Cheat code using key 4
+        if 'cheat' in inputs:
+            self.player_x, self.player_y = game_state.activate_level_2()
+            self.player_velocity_y = 0
+            self.sync_previous()
+            pools.clear()  # Clear pools as level 2 doesn't have them
+            self.adversaries.clear()  # Clear existing adversaries
+            self.events.append('cheat')
+
+        # Update player position
+        self.player_y += self.player_velocity_y * scale
+        self.player_velocity_y += gravity * scale
+
+        # Ground collision
+        if self.player_y >= FLOOR_HEIGHT - player_height:
+            self.player_y = FLOOR_HEIGHT - player_height
+            self.player_velocity_y = 0
+            self.is_jumping = False
+        if profiler is not None:
+            profiler.mark('update')
+
+        # Pool collisions (only check if in level 1 or 3), with a 10px margin for realism
+        if game_state.level == 1 or game_state.level == 3:
+            for pool in pools:
+                if (self.player_x + player_width > pool[0] + 10 and
+                    self.player_x < pool[0] + pool_width - 10 and
+                    self.player_y + player_height > pool[1]):
+                    if not game_state.is_invulnerable:
+                        # Add splash effect
+                        if self.particles is not None:
+                            self.particles.emit_splash(
+                                pool[0] + pool_width//2,
+                                pool[1] + pool_height//2
+                            )
+                        self.events.append('splash')
+                        self.lose_life()
+
+        # Adversary collisions (only check if in level 2 or 3); same overlap test as pygame.Rect
+        if game_state.level >= 2:
+            for adversary in self.adversaries:
+                if (not game_state.is_invulnerable and
+                    int(self.player_x) < int(adversary.x) + adversary.width and
+                    int(adversary.x) < int(self.player_x) + player_width and
+                    int(self.player_y) < int(adversary.y) + adversary.height and
+                    int(adversary.y) < int(self.player_y) + player_height):
+                    self.lose_life()
+
+        if game_state.is_invulnerable:
+            if self.time_ms - game_state.invulnerable_timer >= game_state.invulnerable_duration:
+                game_state.is_invulnerable = False
+        if profiler is not None:
+            profiler.mark('collision')
+
+        return self.events
+
+
+def run_episode(seed=None, policy=None, max_steps=PHYSICS_HZ * 600, **options):
+    """Play one game headlessly; policy(sim) returns the inputs for each step"""
+    sim = GameSimulation(seed=seed, **options)
+    while sim.running and sim.steps < max_steps:
+        sim.step(policy(sim) if policy else ())
+    return sim
+
+
+def jump_before_pools(sim):
+    """A simple scripted player that jumps when a pool or adversary gets close"""
+    for pool in sim.pools:
+        if 0 < pool[0] - sim.player_x < 60:
+            return ('jump',)
+    for adversary in sim.adversaries:
+        if 0 < adversary.x - sim.player_x < 80:
+            return ('jump',)
+    return ()
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run headless games for balance testing")
+    parser.add_argument('--episodes', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--idle', action='store_true', help="never jump instead of using the scripted player")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total_steps = 0
+    levels = {}
+    for episode in range(args.episodes):
+        sim = run_episode(seed=args.seed + episode,
+                          policy=None if args.idle else jump_before_pools,
+                          particles=False)
+        total_steps += sim.steps
+        levels[sim.game_state.level] = levels.get(sim.game_state.level, 0) + 1
+    elapsed = time.perf_counter() - start
+    print(f"{args.episodes} episodes, {total_steps} steps in {elapsed:.2f}s "
+          f"({total_steps / elapsed:.0f} steps/s)")
+    print("Final level reached:", dict(sorted(levels.items())))
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+from asset_specs import ASSET_SPECS, ATLAS_NAME, ATLAS_INDEX_NAME, ATLAS_SPRITES
+
+# Index layout: {"size": [width, height], "sprites": {name: [x, y, width, height]}}
+
+
+def pack(sizes, max_width=512, padding=1):
+    """Shelf-pack named (width, height) boxes; returns ({name: rect}, atlas size)"""
+    # Tallest first keeps each shelf's wasted height small
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], name))
+    rects = {}
+    x = y = shelf_height = width = 0
+    for name in order:
+        w, h = sizes[name]
+        if x and x + w > max_width:
+            y += shelf_height + padding
+            x = shelf_height = 0
+        rects[name] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width = max(width, x - padding)
+    return rects, (width, y + shelf_height)
+
+
+def build_atlas(asset_dir, out_dir=None, sprites=ATLAS_SPRITES):
+    """Scale each sprite to its draw size and pack them into one image plus an index"""
+    import pygame
+
+    out_dir = out_dir or asset_dir
+    sizes = {name: ASSET_SPECS[name]['size'] for name in sprites}
+    rects, size = pack(sizes)
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    for name, (x, y, w, h) in rects.items():
+        image = pygame.image.load(os.path.join(asset_dir, name))
+        atlas.blit(pygame.transform.scale(image, (w, h)), (x, y))
+
+    index = {'size': list(size), 'sprites': {name: list(rect) for name, rect in sorted(rects.items())}}
+    image_path = os.path.join(out_dir, ATLAS_NAME)
+    index_path = os.path.join(out_dir, ATLAS_INDEX_NAME)
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(index_path + '.tmp', index_path)
+    # pygame picks the format from the extension, so keep .png on the temp name
+    tmp_image_path = image_path[:-len('.png')] + '.tmp.png'
+    pygame.image.save(atlas, tmp_image_path)
+    os.replace(tmp_image_path, image_path)
+    return index
+
+
+def load_index(source):
+    """Read an atlas index from a path or file object"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            return json.load(f)
+    return json.load(source)
+
+
+def unpack_atlas(atlas, index):
+    """Get each sprite as a subsurface of the loaded atlas, keyed by name"""
+    return {name: atlas.subsurface(rect) for name, rect in index['sprites'].items()}
+
+
+if __name__ == '__main__':
+    # python sprite_atlas.py [asset_dir] [out_dir]
+    asset_dir = sys.argv[1] if len(sys.argv) > 1 else 'assets'
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else asset_dir
+    index = build_atlas(asset_dir, out_dir)
+    width, height = index['size']
+    print(f"Packed {len(index['sprites'])} sprites into {ATLAS_NAME} ({width}x{height})")
@@ -0,0 +1,65 @@
+import contextlib
+import os
+import pygame
+
+# pygame < 2.1.3 only has the older tostring name
+_to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+
+
+class SurfaceCache:
+    """Persisted render-ready pixels keyed by source hash, target size and pixel format"""
+    def __init__(self, cache_dir='local_assets/surfaces'):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, source_hash, size, pixel_format):
+        """Get the cache file path for a derived surface"""
+        width, height = size
+        return os.path.join(self.cache_dir,
+                            f"{source_hash}_{width}x{height}_{pixel_format}.raw")
+
+    def load(self, source_hash, size, opaque):
+        """Load a cached surface converted for the display, or None on a miss"""
+        pixel_format = 'RGB' if opaque else 'RGBA'
+        path = self.get_path(source_hash, size, pixel_format)
+        try:
+            with open(path, 'rb') as f:
+                pixels = f.read()
+        except OSError:
+            return None
+        # Record the use; the blob store evicts these least recently used first
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+        # A truncated or mismatched file is a miss, not an error
+        if len(pixels) != size[0] * size[1] * len(pixel_format):
+            return None
+        surface = pygame.image.frombuffer(pixels, size, pixel_format)
+        return surface.convert() if opaque else surface.convert_alpha()
+
+    def store(self, source_hash, size, opaque, surface):
+        """Persist the raw pixels of a derived surface"""
+        self.store_pixels(source_hash, size, opaque, _to_bytes(surface, 'RGB' if opaque else 'RGBA'))
+
+    def store_pixels(self, source_hash, size, opaque, pixels):
+        """Persist raw RGB (opaque) or RGBA pixels, e.g. from a decode worker"""
+        pixel_format = 'RGB' if opaque else 'RGBA'
+        path = self.get_path(source_hash, size, pixel_format)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(pixels)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to cache surface {path}: {e}")
+
+    def get(self, source_hash, size, opaque, decode):
+        """Get a render-ready surface, decoding and scaling the source only on a miss"""
+        surface = self.load(source_hash, size, opaque)
+        if surface is not None:
+            return surface
+
+        surface = pygame.transform.scale(decode(), size)
+        surface = surface.convert() if opaque else surface.convert_alpha()
+        self.store(source_hash, size, opaque, surface)
+        return surface
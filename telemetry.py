@@ -0,0 +1,137 @@
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Counts of observed values per bucket, plus their sum"""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last bucket is everything above
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Get (upper bound, observations at or below it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Telemetry:
+    """Thread-safe counters and latency histograms for the asset pipeline
+
+    Metrics are keyed by name and labels (e.g. phase, asset), so one call site
+    can feed per-phase and per-asset series. export() writes a Prometheus text
+    file, a JSON snapshot, or appends the snapshot as one line to a JSON log.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.started = time.time()
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def count(self, name, value=1, **labels):
+        """Add value to a counter"""
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """Record one duration in a latency histogram"""
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Time the body of a with block into a latency histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def total(self, name):
+        """Sum a counter across all of its label values"""
+        with self.lock:
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def snapshot(self):
+        """Get every metric as plain data"""
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), 'count': histogram.count,
+                           'sum': round(histogram.sum, 6),
+                           'buckets': [[bound if bound != float('inf') else '+Inf', total]
+                                       for bound, total in histogram.cumulative()]}
+                          for (name, labels), histogram in sorted(self.histograms.items())]
+        return {'started': self.started, 'time': time.time(),
+                'counters': counters, 'histograms': histograms}
+
+    def prometheus_lines(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        def series(name, labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return name
+            escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                       for _, value in pairs)
+            return name + '{' + ','.join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + '}'
+
+        lines = []
+        typed = set()
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{series(name, labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                for bound, total in histogram.cumulative():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{series(name + '_bucket', labels, [('le', le)])} {total}")
+                lines.append(f"{series(name + '_sum', labels)} {histogram.sum:.6f}")
+                lines.append(f"{series(name + '_count', labels)} {histogram.count}")
+        return lines
+
+    def export(self, path):
+        """Write the metrics to path: .jsonl appends a log line, .json a snapshot, else Prometheus text"""
+        if path.endswith('.jsonl'):
+            with open(path, 'a') as f:
+                f.write(json.dumps(self.snapshot()) + '\n')
+            return path
+        # Scrapers may read the file at any time, so replace it atomically
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump(self.snapshot(), f, indent=2)
+            else:
+                f.write('\n'.join(self.prometheus_lines()) + '\n')
+        os.replace(tmp_path, path)
+        return path